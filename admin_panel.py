@@ -0,0 +1,33 @@
+import json
+
+import streamlit as st
+
+from saju import metrics
+
+
+# ---------------------------------------------------------
+# [관리자] 성능 계측 패널 - app.py 가 관리자 토큰이 맞을 때만 불러온다
+# ---------------------------------------------------------
+def draw_metrics_panel(calc):
+    with st.expander("🛠 성능 계측 (관리자)", expanded=True):
+        if not metrics.enabled:
+            st.info("SAJU_METRICS=1 로 실행하면 단계별 소요 시간과 규칙 성립 횟수가 기록됩니다.")
+            return
+        snap = metrics.snapshot()
+        st.caption(f"프로세스 {snap['pid']} · {snap['uptime_s']:.0f}초 동안 수집 (백분위는 히스토그램 구간 상한 근사)")
+        st.markdown("\n".join(
+            ["| 단계 | 횟수 | 평균(us) | p50 | p90 | p99 | 최대 |", "|---|---:|---:|---:|---:|---:|---:|"]
+            + [f"| {name} | {s['count']} | {s['mean_us']} | {s['p50_us']} | {s['p90_us']} | {s['p99_us']} | {s['max_us']} |"
+               for name, s in snap["stages"].items()]
+        ))
+        cache = calc.score_cache_info()
+        st.caption(f"점수 캐시: 적중 {cache.hits} / 계산 {cache.misses} / 보관 {cache.currsize}")
+        st.markdown("**규칙 성립 횟수**")
+        st.json({"종류별": snap["rule_kinds"], "세력전쟁": snap["battles"], "규칙별": snap["rules"]}, expanded=False)
+        col_json, col_prom = st.columns(2)
+        col_json.download_button("JSON 스냅샷", json.dumps(snap, ensure_ascii=False, indent=2), "saju-metrics.json",
+                                 "application/json")
+        col_prom.download_button("Prometheus 텍스트", metrics.prometheus(), "saju-metrics.prom", "text/plain")
+        if st.button("계측 초기화"):
+            metrics.reset()
+            st.rerun()
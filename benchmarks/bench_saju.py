@@ -0,0 +1,259 @@
+"""사주 계산/점수/렌더링 경로 벤치마크
+
+    python benchmarks/bench_saju.py                          # 전체 실행 -> 표준출력 JSON, baseline.json 과 비교
+    python benchmarks/bench_saju.py --quick --only pillar     # 일부만 빠르게
+    python benchmarks/bench_saju.py -o result.json --check   # 기준보다 느려진 항목이 있으면 종료 코드 1
+    python benchmarks/bench_saju.py --update-baseline        # 현재 결과를 baseline.json 으로 저장
+
+입력은 고정 시드로 만든 가상 생년월일(1950~2030, 시간 모름 20%)이다.
+점수 계산은 캐시 효과를 빼기 위해 캐시 없는 계산기(cache_size=0)로 잰다.
+draw_ohaeng_pie_chart / draw_manse_grid / 폼 제출은 streamlit.testing 의 AppTest(헤드리스)로 앱을 실제로 돌려서 잰다.
+기준(baseline.json)은 같은 기계에서 만든 값과 비교해야 의미가 있다.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from saju import RULES, SajuCalculator  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 20240101
+
+
+# ---------------------------------------------------------
+# 입력 데이터 / 측정
+# ---------------------------------------------------------
+def make_births(n, seed=SEED):
+    """[(생년월일 date, 시 또는 None, 분)] - 고정 시드"""
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    births = []
+    for _ in range(n):
+        birth_date = start + timedelta(days=rng.randrange(80 * 365))
+        if rng.random() < 0.2: births.append((birth_date, None, 0))
+        else: births.append((birth_date, rng.randrange(24), rng.randrange(60)))
+    return births
+
+
+def summarize(samples_ns):
+    """호출 1회 지연 시간(ns) 목록 -> 처리량/백분위(us)"""
+    samples = sorted(samples_ns)
+    n = len(samples)
+
+    def pct(q): return samples[min(n - 1, int(q / 100 * n))] / 1000
+
+    total = sum(samples)
+    return {
+        "n": n, "ops_per_sec": round(n / (total / 1e9), 1) if total else 0.0,
+        "mean_us": round(total / n / 1000, 3), "p50_us": round(pct(50), 3), "p90_us": round(pct(90), 3),
+        "p99_us": round(pct(99), 3), "max_us": round(samples[-1] / 1000, 3),
+    }
+
+
+def measure(fn, args_list, warmup=50):
+    # timeit 처럼 측정 중에는 GC 를 끈다 (앞 단계에서 만든 객체 때문에 결과가 흔들리지 않게)
+    for args in args_list[:warmup]: fn(*args)
+    samples = []
+    clock = time.perf_counter_ns
+    gc.collect()
+    gc.disable()
+    try:
+        for args in args_list:
+            t0 = clock()
+            fn(*args)
+            samples.append(clock() - t0)
+    finally:
+        gc.enable()
+    return summarize(samples)
+
+
+# ---------------------------------------------------------
+# 계산기 경로
+# ---------------------------------------------------------
+def bench_calculator(n):
+    calc = SajuCalculator(cache_size=0)
+    births = make_births(n)
+    known = [b for b in births if b[1] is not None]
+    unknown = [b for b in births if b[1] is None]
+
+    year_pillars = [calc.get_year_pillar(d) for d, _, _ in births]  # 입춘 기준 (양력 연도를 넘기면 월주에서 거부)
+    day_pillars = [calc.get_day_pillar(datetime.combine(d, datetime.min.time())) for d, _, _ in births]
+
+    def pillars_of(birth):
+        d, h, m = birth
+        return calc.analyze(d, h, m, with_logs=False)["pillars"]
+
+    known_pillars = [(pillars_of(b),) for b in known]
+    unknown_pillars = [([*pillars_of(b)[:3], ["??", "??"]],) for b in unknown]
+    scored = [calc.calculate_weighted_scores(p[0]) for p in known_pillars[:n]]
+    rng = random.Random(SEED)
+    ten_god_args = [(rng.choice("갑을병정무기경신임계"), rng.choice("갑을병정무기경신임계자축인묘진사오미신유술해"))
+                    for _ in range(n)]
+
+    return {
+        "get_year_pillar": measure(calc.get_year_pillar, [(d,) for d, _, _ in births]),
+        "get_month_pillar": measure(calc.get_month_pillar, [(y, d) for y, (d, _, _) in zip(year_pillars, births)]),
+        "get_day_pillar": measure(calc.get_day_pillar, [(datetime.combine(d, datetime.min.time()),) for d, _, _ in births]),
+        "get_time_pillar": measure(calc.get_time_pillar, [(p, h) for p, (_, h, _) in zip(day_pillars, births) if h is not None]),
+        "get_ten_gods": measure(calc.get_ten_gods, ten_god_args),
+        "calculate_weighted_scores_known_hour": measure(calc.calculate_weighted_scores, known_pillars),
+        "calculate_weighted_scores_unknown_hour": measure(calc.calculate_weighted_scores, unknown_pillars),
+        "convert_to_sibseong": measure(calc.convert_to_sibseong, [(my, scores) for scores, _, my, _ in scored]),
+    }
+
+
+# ---------------------------------------------------------
+# Streamlit 경로 (헤드리스 AppTest)
+# ---------------------------------------------------------
+def _draw_script():
+    # AppTest 안에서 실행되는 스크립트 (소스만 전달되므로 필요한 것은 안에서 import)
+    import json
+    import os
+    import runpy
+    import time
+    from datetime import date
+
+    import streamlit as st
+
+    from saju import SajuCalculator
+    from saju.charts import ohaeng_pie_spec
+    from saju.render import render_manse_grid
+
+    spec = json.loads(os.environ["SAJU_BENCH_SPEC"])
+    app = runpy.run_path(spec["app"], run_name="saju_bench_app")  # 폼 제출 전 화면까지 실행 + 함수 가져오기
+    calc = SajuCalculator()
+    results = [calc.analyze(date.fromisoformat(d), h, m, with_logs=False) for d, h, m in spec["births"]]
+
+    clock = time.perf_counter_ns
+    chart_ns, grid_ns = [], []
+    with st.container():
+        for r in results[:5]:  # 워밍업 (첫 차트는 Vega-Lite 스키마 로딩 포함)
+            st.vega_lite_chart(app["draw_ohaeng_pie_chart"](r["element_scores"]), width="stretch")
+            app["draw_manse_grid"](r["codes"])
+        ohaeng_pie_spec.cache_clear()
+        render_manse_grid.cache_clear()
+        for r in results:
+            t0 = clock()
+            st.vega_lite_chart(app["draw_ohaeng_pie_chart"](r["element_scores"]), width="stretch")
+            chart_ns.append(clock() - t0)
+            t0 = clock()
+            app["draw_manse_grid"](r["codes"])
+            grid_ns.append(clock() - t0)
+    with open(spec["out"], "w") as f:
+        json.dump({"draw_ohaeng_pie_chart": chart_ns, "draw_manse_grid": grid_ns}, f)
+
+
+def bench_streamlit(n, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    births = [(d.isoformat(), h, m) for d, h, m in make_births(n, SEED + 1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "draw.json")
+        os.environ["SAJU_BENCH_SPEC"] = json.dumps({"app": APP_PATH, "births": births, "out": out})
+        at = AppTest.from_function(_draw_script, default_timeout=600)
+        at.run()
+        if at.exception: raise RuntimeError(at.exception)
+        with open(out) as f:
+            samples = json.load(f)
+    results = {name: summarize(ns) for name, ns in samples.items()}
+
+    # 폼 제출 한 번 = 스크립트 전체 재실행. 결과 캐시가 맞지 않도록 매번 다른 생년월일
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.run()
+    samples = []
+    for i, (birth_date, hour, minute) in enumerate(make_births(reruns + 2, SEED + 2)):
+        at.text_input[0].input("벤치")
+        at.date_input[0].set_value(birth_date)
+        at.time_input[0].set_value(datetime.min.time().replace(hour=hour or 0, minute=minute))
+        if hour is None: at.checkbox[0].check()
+        else: at.checkbox[0].uncheck()
+        at.button[0].click()
+        t0 = time.perf_counter_ns()
+        at.run()
+        elapsed = time.perf_counter_ns() - t0
+        if at.exception: raise RuntimeError(at.exception)
+        if i >= 2: samples.append(elapsed)  # 처음 두 번은 워밍업
+    results["form_submit_rerun"] = summarize(samples)
+    return results
+
+
+# ---------------------------------------------------------
+# 기준 비교
+# ---------------------------------------------------------
+def compare(results, baseline, tolerance):
+    """p50 이 기준보다 tolerance 넘게 느려진 항목 -> [(이름, 기준 p50, 현재 p50, 비율)]"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["p50_us"]: continue
+        ratio = stats["p50_us"] / base["p50_us"]
+        stats["baseline_p50_us"] = base["p50_us"]
+        stats["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance: regressions.append((name, base["p50_us"], stats["p50_us"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사주 계산/렌더링 벤치마크")
+    parser.add_argument("-n", type=int, default=20000, help="계산기 항목당 입력 수 (기본 20000)")
+    parser.add_argument("--draw-n", type=int, default=500, help="차트/원국표 그리기 횟수 (기본 500)")
+    parser.add_argument("--reruns", type=int, default=30, help="폼 제출 재실행 횟수 (기본 30)")
+    parser.add_argument("--quick", action="store_true", help="입력 수를 1/10 로")
+    parser.add_argument("--only", help="이 문자열이 이름에 들어간 항목만 (calculator/streamlit 묶음 단위로 실행)")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본: 표준출력)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="p50 허용 증가율 (기본 0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true", help="느려진 항목이 있으면 종료 코드 1")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    if args.quick: args.n, args.draw_n, args.reruns = args.n // 10, args.draw_n // 10, max(3, args.reruns // 10)
+
+    results = {}
+    calculator_names = ("pillar", "ten_gods", "weighted", "sibseong")
+    if not args.only or any(args.only in name for name in calculator_names):
+        results.update(bench_calculator(args.n))
+    if not args.only or any(args.only in name for name in ("draw", "ohaeng", "manse", "form", "rerun")):
+        results.update(bench_streamlit(args.draw_n, args.reruns))
+    if args.only: results = {k: v for k, v in results.items() if args.only in k}
+
+    report = {
+        "meta": {
+            "seed": SEED, "python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor() or platform.machine(), "cpu_count": os.cpu_count(),
+            "rules_version": RULES.version, "n": args.n, "draw_n": args.draw_n, "reruns": args.reruns,
+        },
+        "results": results,
+    }
+    regressions = []
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = [name for name, *_ in regressions]
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+    else:
+        print(text)
+    for name, base, now, ratio in regressions:
+        print(f"느려짐: {name} p50 {base:.2f}us -> {now:.2f}us (x{ratio:.2f})", file=sys.stderr)
+    if args.check and regressions: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# 사주 계산 코어 (UI 없음)
+# streamlit/pandas/altair 에 의존하지 않으며, numpy 가 필요한 배치/점수표는 처음 쓸 때 불러온다.
+# import 비용 확인: python -X importtime -c "import saju"
+from .calculator import SajuCalculator, render_logs, score_pillar_codes
+from .interpretation import default_desc, ilju_data, sibseong_desc_db
+from .rules import RULES, CompiledRules, load_rule_table
+from .tables import (
+    ELEMENTS, GAN, GAN_ELEM, GAN_POL, GANJI, GANJI_INDEX, GEUK, JI, JI_ELEM, JI_POL,
+    POWER_DESCS, SAENG, SIBSEONG_NAMES, TEN_GOD_NAMES,
+)
+
+_LAZY = {"SajuBatchCalculator": "batch", "ScoreTable": "score_table", "PillarIndex": "pillar_index",
+         "CompatibilityEngine": "compat"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
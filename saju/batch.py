@@ -0,0 +1,93 @@
+import numpy as np
+
+from .solar_terms import FIRST_YEAR, TERMS_PATH
+
+# ---------------------------------------------------------
+# [배치] 대량 생년월일용 NumPy 사주 계산기
+# ---------------------------------------------------------
+# 결과는 60갑자 번호(0~59, 0=갑자)로 돌려준다. 번호 n의 천간은 n % 10, 지지는 n % 12
+# 이므로 문자열이 필요하면 calc.get_60ganji(n, n) 으로 바꾸면 된다.
+# 시간을 모르는 경우 hour 자리에 -1 을 넣으면 시주 번호도 -1 로 나온다.
+# 연/월 경계는 SajuCalculator 와 같은 절기표를 np.searchsorted 로 한 번에 찾는다.
+class SajuBatchCalculator:
+    epoch = np.datetime64("1900-01-01", "D")
+    _terms = None
+
+    @staticmethod
+    def ganji_code(gan_idx, ji_idx):
+        # 천간/지지 번호 -> 60갑자 번호 (중국인의 나머지 정리, 음양이 맞는 조합만 유효)
+        return (6 * np.asarray(gan_idx) - 5 * np.asarray(ji_idx)) % 60
+
+    @staticmethod
+    def to_days(dates):
+        return np.asarray(dates, dtype="datetime64[D]")
+
+    @classmethod
+    def terms(cls):
+        if cls._terms is None: cls._terms = np.memmap(TERMS_PATH, dtype="<i4", mode="r")
+        return cls._terms
+
+    def to_minutes(self, dates, hours=None, minutes=None):
+        # 한국 시각 -> 1900-01-01 00:00 부터의 분. 시간 모름(-1)이나 hours 생략은 정오
+        days = (self.to_days(dates) - self.epoch).astype(np.int64)
+        if hours is None: return days * 1440 + 12 * 60
+        hours = np.asarray(hours, dtype=np.int64)
+        minutes = 0 if minutes is None else np.asarray(minutes, dtype=np.int64)
+        return days * 1440 + np.where(hours < 0, 12 * 60, hours * 60 + minutes)
+
+    def get_saju_year_months(self, dates, hours=None, minutes=None):
+        # 절기 기준 (사주 연도, 월 번호 0=인월 ~ 11=축월)
+        terms = self.terms()
+        idx = np.searchsorted(terms, self.to_minutes(dates, hours, minutes), side="right") - 1
+        in_table = (idx >= 0) & (idx < len(terms) - 1)
+        k = idx % 12
+        years = FIRST_YEAR + idx // 12 - (k == 0)
+        # 절기표 범위 밖은 예전 근사 (매월 6일, 1월 1일)
+        days = self.to_days(dates)
+        month_start = days.astype("datetime64[M]")
+        month = month_start.astype(np.int64) % 12 + 1
+        day = (days - month_start).astype(np.int64) + 1
+        month = np.where(day < 6, month - 1, month)
+        month = np.where(month == 0, 12, month)
+        calendar_years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+        return np.where(in_table, years, calendar_years), np.where(in_table, (k - 1) % 12, (month - 2) % 12)
+
+    def get_year_pillars(self, years, hours=None, minutes=None):
+        # 정수 배열은 입춘 기준 사주 연도, 날짜 배열은 절기표로 해를 정한다 (hours/minutes 는 날짜일 때만)
+        years = np.asarray(years)
+        if years.dtype.kind not in "iu": years = self.get_saju_year_months(years, hours, minutes)[0]
+        return ((years.astype(np.int64) - 1984) % 60).astype(np.int16)
+
+    def get_month_pillars_by_idx(self, year_codes, saju_month_idx):
+        start_gan_idx = (np.asarray(year_codes, dtype=np.int64) % 10 % 5) * 2 + 2
+        month_gan_idx = (start_gan_idx + saju_month_idx) % 10
+        return self.ganji_code(month_gan_idx, (saju_month_idx + 2) % 12).astype(np.int16)
+
+    def get_month_pillars(self, year_codes, dates, hours=None, minutes=None):
+        # 월간은 각 날짜의 절기 기준 연도에서 정한다. year_codes 가 그와 다르면 거부 (None 이면 확인 생략)
+        saju_years, saju_month_idx = self.get_saju_year_months(dates, hours, minutes)
+        expected = self.get_year_pillars(saju_years)
+        if year_codes is not None and np.any(np.asarray(year_codes) != expected):
+            raise ValueError("절기 기준 연주와 다른 연주가 들어 있습니다 (get_year_pillars(dates) 로 구하세요)")
+        return self.get_month_pillars_by_idx(expected, saju_month_idx)
+
+    def get_day_pillars(self, dates):
+        days_diff = (self.to_days(dates) - self.epoch).astype(np.int64)
+        return ((10 + days_diff) % 60).astype(np.int16)
+
+    def get_time_pillars(self, day_codes, hours):
+        hours = np.asarray(hours, dtype=np.int64)
+        time_idx = (hours + 1) // 2 % 12
+        start_gan_idx = (np.asarray(day_codes, dtype=np.int64) % 10 % 5) * 2
+        codes = self.ganji_code((start_gan_idx + time_idx) % 10, time_idx)
+        return np.where(hours < 0, -1, codes).astype(np.int16)
+
+    def get_four_pillars(self, dates, hours, minutes=None):
+        days = self.to_days(dates)
+        hours = np.asarray(hours, dtype=np.int64)
+        saju_years, saju_month_idx = self.get_saju_year_months(days, hours, minutes)
+        year_codes = self.get_year_pillars(saju_years)
+        month_codes = self.get_month_pillars_by_idx(year_codes, saju_month_idx)
+        day_codes = self.get_day_pillars(days)
+        time_codes = self.get_time_pillars(day_codes, hours)
+        return year_codes, month_codes, day_codes, time_codes
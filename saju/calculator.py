@@ -0,0 +1,308 @@
+from datetime import date, datetime, time
+from functools import lru_cache
+from time import perf_counter_ns
+
+from . import metrics
+from .rules import CHUNG_PILLARS, RULES
+from .solar_terms import get_solar_terms
+from .tables import (
+    BASE_WEIGHTS, BATTLE_DRAIN, BATTLE_REVOLT, BATTLE_SUPPRESS, BRANCH_TEN_GOD, ELEMENTS, GAN,
+    GAN_ELEM, GANJI, GANJI_INDEX, GEUK, JI, JI_ELEM, POWER_DESCS, POWER_THRESHOLDS, SAENG, SIBSEONG_NAMES,
+    SIBSEONG_OFFSETS, STEM_TEN_GOD, SUPPORT, TEN_GOD_NAMES,
+)
+
+
+def score_pillar_codes(codes, rules=RULES):
+    """60갑자 코드 4개(시간 모름은 -1) -> (오행 점수 5개, 신강 점수, 일간 오행, fired, battle)"""
+    element_scores, _, total_strength_score, fired, _, _ = pre_battle_state(codes, rules)
+    my_element = GAN_ELEM[codes[2] % 10]
+    total_strength_score, battle = apply_battle(element_scores, total_strength_score, my_element)
+    return tuple(element_scores), total_strength_score, my_element, fired, battle
+
+
+def pre_battle_state(codes, rules=RULES, marks=None):
+    """Step 1~6 -> (오행 점수, 지지 오행 점수, 신강 점수, fired, 천간 마스크, 지지 마스크). 대운/세운은 여기에 더한다
+
+    marks 에 리스트를 주면 각 Step 이 끝날 때마다 perf_counter_ns() 를 덧붙인다 (saju.metrics 계측용)
+    """
+    day_stem = codes[2] % 10
+    my_element = GAN_ELEM[day_stem]
+    support = SUPPORT[my_element]
+
+    element_scores = [0, 0, 0, 0, 0]
+    jiji_scores = [0, 0, 0, 0, 0]
+    total_strength_score = 0
+    fired = 0
+    stems = []
+    branches = []
+    stem_mask = 0
+    branch_mask = 0
+
+    # Step 1: 기본 점수
+    for i, code in enumerate(codes):
+        if code < 0: continue
+        stem, branch = code % 10, code % 12
+        w_stem, w_branch = BASE_WEIGHTS[i]
+        elem = GAN_ELEM[stem]
+        element_scores[elem] += w_stem
+        total_strength_score += support[elem] * w_stem
+        elem = JI_ELEM[branch]
+        element_scores[elem] += w_branch
+        jiji_scores[elem] += w_branch
+        total_strength_score += support[elem] * w_branch
+        stems.append(stem)
+        branches.append(branch)
+        stem_mask |= 1 << stem
+        branch_mask |= 1 << branch
+    if marks is not None: marks.append(perf_counter_ns())
+
+    # Step 2: 천간충
+    chung_penalty = rules.chung_penalty[day_stem]
+    for bit, i in enumerate(CHUNG_PILLARS):
+        if i < len(codes) and codes[i] >= 0:
+            penalty = chung_penalty[codes[i] % 10]
+            if penalty:
+                element_scores[my_element] -= penalty
+                total_strength_score -= penalty
+                fired |= 1 << bit
+    if marks is not None: marks.append(perf_counter_ns())
+
+    # Step 3: 천간합 (천간 마스크로 한 번에 조회)
+    hap_fired, deltas, gains = rules.stem_events(stem_mask)
+    if hap_fired:
+        fired |= hap_fired
+        for elem in range(5):
+            element_scores[elem] += deltas[elem]
+            total_strength_score += support[elem] * gains[elem]
+    if marks is not None: marks.append(perf_counter_ns())
+
+    # Step 4, 5: 지지충 / 삼합·방합 (지지 마스크로 한 번에 조회)
+    jiji_chung, hap3_fired, adds = rules.branch_events(branch_mask)
+    for k, e1, e2, sc in jiji_chung:
+        w, l = (e1, e2) if jiji_scores[e1] >= jiji_scores[e2] else (e2, e1)
+        element_scores[w] += sc
+        element_scores[l] -= sc
+        total_strength_score += support[w] * sc - support[l] * sc
+        fired |= 1 << (rules.jiji_chung_bit + 2 * k + (w != e1))
+    if marks is not None: marks.append(perf_counter_ns())
+    if hap3_fired:
+        fired |= hap3_fired
+        for elem in range(5):
+            element_scores[elem] += adds[elem]
+            total_strength_score += support[elem] * adds[elem]
+    if marks is not None: marks.append(perf_counter_ns())
+
+    # Step 6: 병존
+    bonus = rules.byeongjon_score
+    for offset, seq, elements in [(0, stems, GAN_ELEM), (3, branches, JI_ELEM)]:
+        for k in range(len(seq) - 1):
+            if seq[k] == seq[k + 1]:
+                elem = elements[seq[k]]
+                element_scores[elem] += bonus
+                total_strength_score += support[elem] * bonus
+                fired |= 1 << (rules.byeongjon_bit + offset + k)
+    if marks is not None: marks.append(perf_counter_ns())
+
+    return element_scores, jiji_scores, total_strength_score, fired, stem_mask, branch_mask
+
+
+def apply_battle(element_scores, total_strength_score, my_element):
+    """Step 7: Top 2 Battle (element_scores 를 직접 고친다) -> (신강 점수, battle)"""
+    # 동점이면 목화토금수 순서 유지
+    order = sorted(range(5), key=element_scores.__getitem__, reverse=True)
+    top1_elem, top2_elem = order[0], order[1]
+    battle = 0
+    bonus = 10
+
+    if GEUK[top1_elem] == top2_elem:
+        element_scores[top1_elem] += bonus
+        element_scores[top2_elem] -= bonus
+        battle = BATTLE_SUPPRESS
+    elif GEUK[top2_elem] == top1_elem:
+        element_scores[top2_elem] += bonus
+        element_scores[top1_elem] -= bonus
+        battle = BATTLE_REVOLT
+        if top1_elem == my_element: total_strength_score -= bonus
+        if top2_elem == my_element: total_strength_score += bonus
+    elif SAENG[top1_elem] == top2_elem:
+        element_scores[top1_elem] -= 5
+        element_scores[top2_elem] += 10
+        battle = BATTLE_DRAIN
+    if battle: battle = battle * 25 + top1_elem * 5 + top2_elem
+    return total_strength_score, battle
+
+
+def render_logs(codes, fired, battle, rules=RULES):
+    """score_pillar_codes 의 fired/battle 을 화면용 로그 문장으로 변환"""
+    logs = rules.render_logs(codes, fired)
+    if battle: logs.append(render_battle_log(battle))
+    return logs
+
+
+def render_battle_log(battle):
+    kind, top1, top2 = battle // 25, ELEMENTS[battle // 5 % 5], ELEMENTS[battle % 5]
+    if kind == BATTLE_SUPPRESS: battle_log = f"1위({top1})가 2위({top2})를 제압하여 격차 벌어짐"
+    elif kind == BATTLE_REVOLT: battle_log = f"2위({top2})가 1위({top1})를 맹렬히 공격! (하극상)"
+    else: battle_log = f"1위({top1})가 2위({top2})를 생하여 기운 설기됨"
+    return f"🏆 **세력전쟁:** {battle_log}"
+
+
+# ---------------------------------------------------------
+# [핵심] 사주팔자 계산기
+# ---------------------------------------------------------
+class SajuCalculator:
+    def __init__(self, score_table=None, cache_size=65536, rules=None):
+        self.gan = list(GAN)
+        self.ji = list(JI)
+        self.month_ji = list("인묘진사오미신유술해자축")
+        self.rules = rules or RULES
+        # 점수는 기둥 코드에만 의존 -> 미리 만든 점수표(mmap) 또는 LRU 캐시로 재사용
+        if score_table is not None and score_table.rules_version != self.rules.version:
+            raise ValueError(f"점수표 규칙 버전({score_table.rules_version})이 현재 규칙({self.rules.version})과 다릅니다")
+        self.score_table = score_table
+        self.cache_size = cache_size
+        self._cached_score = lru_cache(maxsize=cache_size)(self._score_uncached)
+        # SAJU_METRICS=1 일 때만 단계별 시간/규칙 횟수를 재는 메서드로 바꿔 끼운다 (꺼져 있으면 비용 0)
+        if metrics.enabled: metrics.instrument(self)
+
+    # --- 문자열 <-> 코드 (화면 경계에서만 사용) ---
+    def get_60ganji(self, gan_idx, ji_idx): return self.gan[gan_idx % 10] + self.ji[ji_idx % 12]
+
+    def to_ganji(self, code): return GANJI[code] if code >= 0 else "??"
+
+    def pillar_code(self, pillar):
+        # "갑자" -> 0, 모르는 기둥("??", ["??", "??"], None) -> -1
+        if not pillar: return -1
+        return GANJI_INDEX.get("".join(pillar), -1)
+
+    # --- 기둥 계산 (코드) ---
+    def get_year_code(self, year): return (year - 1984) % 60
+
+    def get_saju_year_month(self, moment):
+        # 절기 기준 (사주 연도, 월 번호 0=인월 ~ 11=축월). moment 는 한국 시각, 날짜만 주면 정오
+        result = get_solar_terms().saju_year_month(moment)
+        if result is not None: return result
+        # 절기표 범위(1900~2100) 밖은 예전 근사: 매월 6일에 월이 바뀌고 1월 1일에 해가 바뀐다
+        month = moment.month
+        if moment.day < 6:
+            month -= 1
+            if month == 0: month = 12
+        return moment.year, (month - 2) % 12
+
+    def get_month_code_by_idx(self, year_code, saju_month_idx):
+        start_gan_idx = (year_code % 10 % 5) * 2 + 2
+        month_gan_idx = (start_gan_idx + saju_month_idx) % 10
+        return (6 * month_gan_idx - 5 * (saju_month_idx + 2)) % 60
+
+    def get_year_code_by_date(self, moment):
+        # 입춘 기준 연주 번호 (날짜만 주면 정오)
+        return self.get_year_code(self.get_saju_year_month(moment)[0])
+
+    def get_month_code(self, year_code, date_obj):
+        # 월간은 date_obj 의 절기 기준 연도에서 정한다. 다른 해의 연주(양력 연도로 구한 것 등)를 주면 거부
+        saju_year, saju_month_idx = self.get_saju_year_month(date_obj)
+        expected = self.get_year_code(saju_year)
+        if year_code is not None and year_code != expected:
+            raise ValueError(f"연주 {self.to_ganji(year_code)} 는 {date_obj} 의 절기 기준 연주 {GANJI[expected]} 와 다릅니다")
+        return self.get_month_code_by_idx(expected, saju_month_idx)
+
+    def get_day_code(self, date_obj):
+        days_diff = (date_obj - datetime(1900, 1, 1)).days
+        return (10 + days_diff) % 60
+
+    def get_time_code(self, day_code, hour):
+        time_idx = (hour + 1) // 2 % 12
+        start_gan_idx = (day_code % 10 % 5) * 2
+        return (6 * ((start_gan_idx + time_idx) % 10) - 5 * time_idx) % 60
+
+    # --- 기둥 계산 (문자열) ---
+    def get_year_pillar(self, year):
+        # date/datetime 은 입춘 기준으로 해를 정하고, 정수는 이미 입춘 기준인 사주 연도로 본다
+        if isinstance(year, date): return GANJI[self.get_year_code_by_date(year)]
+        return GANJI[self.get_year_code(year)]
+
+    def get_month_pillar(self, year_pillar, date_obj):
+        # year_pillar 는 get_year_pillar(date_obj) 와 같아야 한다 (None 이면 확인 생략)
+        year_code = None if year_pillar is None else self.pillar_code(year_pillar)
+        return GANJI[self.get_month_code(year_code, date_obj)]
+
+    def get_day_pillar(self, date_obj): return GANJI[self.get_day_code(date_obj)]
+
+    def get_time_pillar(self, day_pillar, hour):
+        return GANJI[self.get_time_code(self.pillar_code(day_pillar), hour)]
+
+    # --- 원국 (폼과 같은 순서, hour=None 이면 시간 모름) ---
+    def get_pillar_codes(self, birth_date, hour=None, minute=0):
+        # 연/월은 절기 기준이라 태어난 시각까지 본다 (시간 모름은 정오)
+        moment = datetime.combine(birth_date, time(12) if hour is None else time(hour, minute))
+        saju_year, saju_month_idx = self.get_saju_year_month(moment)
+        year_code = self.get_year_code(saju_year)
+        month_code = self.get_month_code_by_idx(year_code, saju_month_idx)
+        day_code = self.get_day_code(datetime(birth_date.year, birth_date.month, birth_date.day))
+        time_code = -1 if hour is None else self.get_time_code(day_code, hour)
+        return year_code, month_code, day_code, time_code
+
+    # --- 십성 ---
+    def get_stem_ten_god(self, day_stem, stem): return TEN_GOD_NAMES[STEM_TEN_GOD[day_stem][stem]]
+
+    def get_branch_ten_god(self, day_stem, branch): return TEN_GOD_NAMES[BRANCH_TEN_GOD[day_stem][branch]]
+
+    def get_ten_gods(self, day_gan, target_char):
+        # 문자열 호환용: "신"은 천간(辛)으로 본다
+        if not target_char or len(target_char) != 1: return ""
+        if target_char in GAN: return self.get_stem_ten_god(GAN.index(day_gan), GAN.index(target_char))
+        if target_char in JI: return self.get_branch_ten_god(GAN.index(day_gan), JI.index(target_char))
+        return ""
+
+    # --- 점수 ---
+    def score_codes(self, codes):
+        if len(codes) == 3: codes = (*codes, -1)
+        return self._cached_score(tuple(codes))
+
+    def _score_uncached(self, codes):
+        if self.score_table is not None:
+            result = self.score_table.lookup(codes)
+            if result is not None: return result
+        return score_pillar_codes(codes, self.rules)
+
+    def score_cache_info(self): return self._cached_score.cache_info()
+
+    def score_cache_clear(self): self._cached_score.cache_clear()
+
+    def render_logs(self, codes, fired, battle): return render_logs(codes, fired, battle, self.rules)
+
+    def calculate_weighted_scores(self, pillars):
+        codes = tuple(self.pillar_code(p) for p in pillars)
+        scores, total_strength_score, my_element, fired, battle = self.score_codes(codes)
+        element_scores = dict(zip(ELEMENTS, scores))
+        return element_scores, total_strength_score, ELEMENTS[my_element], self.render_logs(codes, fired, battle)
+
+    def sibseong_codes(self, my_element, scores):
+        return tuple(scores[(my_element + offset) % 5] for offset in SIBSEONG_OFFSETS)
+
+    def convert_to_sibseong(self, my_element, element_scores):
+        scores = [element_scores[e] for e in ELEMENTS]
+        return dict(zip(SIBSEONG_NAMES, self.sibseong_codes(ELEMENTS.index(my_element), scores)))
+
+    def get_power_bucket(self, strength_score):
+        # POWER_DESCS 위치 (0=극신강 ~ 3=극신약)
+        for bucket, threshold in enumerate(POWER_THRESHOLDS):
+            if strength_score > threshold: return bucket
+        return len(POWER_THRESHOLDS)
+
+    def get_power_desc(self, strength_score): return POWER_DESCS[self.get_power_bucket(strength_score)]
+
+    # --- 폼 한 번 제출과 같은 전체 계산 ---
+    def analyze(self, birth_date, hour=None, minute=0, with_logs=True):
+        codes = self.get_pillar_codes(birth_date, hour, minute)
+        scores, strength_score, my_element, fired, battle = self.score_codes(codes)
+        return {
+            "codes": codes,
+            "pillars": [self.to_ganji(c) for c in codes],
+            "my_element": ELEMENTS[my_element],
+            "element_scores": dict(zip(ELEMENTS, scores)),
+            "strength": strength_score,
+            "power_desc": self.get_power_desc(strength_score),
+            "sibseong_scores": dict(zip(SIBSEONG_NAMES, self.sibseong_codes(my_element, scores))),
+            "logs": self.render_logs(codes, fired, battle) if with_logs else None,
+        }
@@ -0,0 +1,68 @@
+# ---------------------------------------------------------
+# [차트] 오행 도넛 차트 Vega-Lite 스펙
+# ---------------------------------------------------------
+# 예전에는 5줄짜리 DataFrame + Altair 객체를 매번 만들었는데, 데이터보다 그 비용이 훨씬 컸다.
+# Altair 가 만들던 스펙을 템플릿으로 고정해 두고 점수 5개로 data 만 채운다.
+# 결과 dict 는 점수 벡터로 캐시해서 공유하므로 읽기 전용으로만 쓸 것.
+from functools import lru_cache
+
+from .tables import ELEMENTS
+
+EMOJI_MAP = {"목": "🌲", "화": "🔥", "토": "⛰️", "금": "⚔️", "수": "🌊"}
+COLOR_RANGE = ["#66BB6A", "#EF5350", "#FFCA28", "#BDBDBD", "#42A5F5"]
+
+_THETA = {"field": "점수", "stack": True, "type": "quantitative"}
+_ORDER = {"field": "점수", "sort": "descending", "type": "quantitative"}
+
+OHAENG_PIE_TEMPLATE = {
+    "config": {"view": {"continuousWidth": 300, "continuousHeight": 300}},
+    "layer": [
+        {
+            "mark": {"type": "arc", "innerRadius": 55, "outerRadius": 110},
+            "encoding": {
+                "color": {
+                    "field": "구분",
+                    "legend": {"title": "오행"},
+                    "scale": {"domain": list(ELEMENTS), "range": COLOR_RANGE},
+                    "type": "nominal",
+                },
+                "order": _ORDER,
+                "theta": _THETA,
+                "tooltip": [
+                    {"field": "구분", "type": "nominal"},
+                    {"field": "점수", "type": "quantitative"},
+                    {"field": "비율", "format": ".1%", "type": "quantitative"},
+                ],
+            },
+        },
+        {
+            "mark": {"type": "text", "radius": 125},
+            "encoding": {
+                "color": {"value": "black"},
+                "order": _ORDER,
+                "size": {"value": 18},
+                "text": {"field": "라벨", "type": "nominal"},
+                "theta": _THETA,
+            },
+            # 3% 이하 조각은 라벨 생략
+            "transform": [{"filter": "(datum.비율 > 0.03)"}],
+        },
+    ],
+}
+
+
+@lru_cache(maxsize=4096)
+def ohaeng_pie_spec(scores):
+    """오행 점수 5개 (목화토금수 순서 튜플) -> Vega-Lite 스펙 dict"""
+    safe_scores = [max(0, score) for score in scores]
+    total = sum(safe_scores) or 1
+    values = []
+    for elem, safe_score in zip(ELEMENTS, safe_scores):
+        ratio = safe_score / total
+        emoji = EMOJI_MAP[elem]
+        # pandas .round(1).astype(str) 와 같은 결과 (x10 -> 반올림(짝수) -> /10)
+        values.append({
+            "구분": elem, "점수": safe_score, "이모지": emoji, "비율": ratio,
+            "라벨": f"{emoji} {round(ratio * 100 * 10) / 10}%",
+        })
+    return dict(OHAENG_PIE_TEMPLATE, data={"values": values})
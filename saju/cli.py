@@ -0,0 +1,258 @@
+# ---------------------------------------------------------
+# [대량 처리] CSV/JSONL 생년월일 파일 -> 분석 결과 파일
+# ---------------------------------------------------------
+# 폼과 같은 순서(기둥 -> calculate_weighted_scores -> convert_to_sibseong -> 신강/신약)로 계산한다.
+# 입력은 chunk 단위로 읽고, 프로세스 풀에서 계산한 뒤 입력 순서대로 바로 써서 메모리가 일정하다.
+#
+#   python -m saju records.csv -o result.jsonl --workers 8
+#   python -m saju records.jsonl -o result.csv --resume     # 중단된 곳부터 이어서
+#
+# 입력 컬럼: birth_date(YYYY-MM-DD), birth_time(HH:MM, 비어 있거나 unknown/모름 이면 시간 모름), gender.
+# 그 밖의 컬럼은 그대로 출력에 붙는다.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+
+from .tables import ELEMENTS, SIBSEONG_NAMES
+from .worker import get_calculator
+
+UNKNOWN_TIMES = {"", "unknown", "모름", "?", "??"}
+RESULT_FIELDS = (
+    ["year_pillar", "month_pillar", "day_pillar", "time_pillar", "my_element"]
+    + list(ELEMENTS)
+    + ["strength", "power_desc"]
+    + [name.split()[0] for name in SIBSEONG_NAMES]
+    + ["top_sibseong", "logs", "error"]
+)
+
+
+def parse_birth_time(value):
+    # "HH:MM" (또는 13 처럼 숫자 시) -> (시, 분), 시간 모름 -> (None, 0)
+    value = "" if value is None else str(value).strip()
+    if value.lower() in UNKNOWN_TIMES: return None, 0
+    hour, _, minute = value.partition(":")
+    hour, minute = int(hour), int(minute[:2] or 0)
+    if not (0 <= hour <= 23 and 0 <= minute <= 59): raise ValueError(f"시간 범위 오류: {value}")
+    return hour, minute
+
+
+class UnreadableRecord(dict):
+    # 읽는 단계에서 이미 실패한 줄 ({"record": 원문, "error": ...}). analyze_record 가 그대로 내보낸다
+    pass
+
+
+def analyze_record(record, with_logs=False):
+    if isinstance(record, UnreadableRecord): return dict(record)
+    out = dict(record) if isinstance(record, dict) else {"record": record}
+    try:
+        birth_date = date.fromisoformat(str(record["birth_date"]).strip())
+        hour, minute = parse_birth_time(record.get("birth_time"))
+        result = get_calculator().analyze(birth_date, hour, minute, with_logs=with_logs)
+    except (KeyError, ValueError, TypeError, AttributeError) as e:  # 한 줄이 잘못돼도 나머지는 계속
+        out["error"] = f"{type(e).__name__}: {e}"
+        return out
+
+    out["year_pillar"], out["month_pillar"], out["day_pillar"], out["time_pillar"] = result["pillars"]
+    out["my_element"] = result["my_element"]
+    out.update(result["element_scores"])
+    out["strength"] = result["strength"]
+    out["power_desc"] = result["power_desc"]
+    sibseong = result["sibseong_scores"]
+    for name, score in sibseong.items():
+        out[name.split()[0]] = score
+    out["top_sibseong"] = max(sibseong, key=sibseong.get).split()[0]
+    if with_logs: out["logs"] = result["logs"]
+    return out
+
+
+def _analyze_chunk(args):
+    records, with_logs = args
+    return [analyze_record(r, with_logs) for r in records]
+
+
+# ---------------------------------------------------------
+# 입출력
+# ---------------------------------------------------------
+def _detect_format(path, fmt):
+    if fmt: return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path, fmt):
+    # 형식이 깨진 줄도 UnreadableRecord 한 건으로 내보내 결과 줄 수가 입력 레코드 수와 맞게 한다
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    with f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield UnreadableRecord(record=f"{reader.line_num}번째 줄", error=f"csv.Error: {e}")
+                    continue
+                yield row
+        else:
+            for line in f:
+                if not line.strip(): continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield UnreadableRecord(record=line.rstrip("\r\n"), error=f"JSONDecodeError: {e}")
+
+
+def _count_lines(f, block_size=1 << 20):
+    # 블록 단위로 줄바꿈을 센다 -> (줄 수, 마지막 줄바꿈 다음 위치)
+    count = end = pos = 0
+    while True:
+        block = f.read(block_size)
+        if not block: return count, end
+        n = block.count(b"\n")
+        if n:
+            count += n
+            end = pos + block.rindex(b"\n") + 1
+        pos += len(block)
+
+
+def _count_csv_records(f):
+    # 따옴표 안 줄바꿈이 있어도 레코드 단위로 센다 -> (헤더 포함 레코드 수, 마지막 완성 레코드 다음 위치)
+    consumed, complete = [0], [True]
+
+    def lines():
+        for line in f:
+            consumed[0] += len(line)
+            complete[0] = line.endswith(b"\n")
+            yield line.decode("utf-8")
+
+    count = end = 0
+    try:
+        for _ in csv.reader(lines(), strict=True):
+            if not complete[0]: break   # 줄바꿈 없이 끝난 마지막 레코드는 잘린 것
+            count += 1
+            end = consumed[0]
+    except csv.Error:                    # 따옴표 안에서 파일이 끝남 = 잘린 레코드
+        pass
+    return count, end
+
+
+def count_done(path):
+    # 이어하기: 끝이 잘린 레코드가 있으면 잘라내고, 완성된 레코드 수를 돌려준다 (파일 전체를 메모리에 올리지 않음)
+    if not os.path.exists(path): return 0
+    is_csv = path.lower().endswith(".csv")
+    with open(path, "rb+") as f:
+        count, end = _count_csv_records(f) if is_csv else _count_lines(f)
+        if end != f.seek(0, os.SEEK_END): f.truncate(end)
+    return count - 1 if is_csv and count else count
+
+
+class ResultWriter:
+    def __init__(self, path, fmt, append, input_fields):
+        self.fmt = fmt
+        self.f = sys.stdout if path == "-" else open(path, "a" if append else "w", encoding="utf-8", newline="")
+        self.csv = None
+        self.header_written = append
+        self.input_fields = input_fields
+
+    def write(self, rows):
+        if self.fmt == "csv":
+            if self.csv is None:
+                fields = [k for k in (self.input_fields or rows[0]) if k not in RESULT_FIELDS] + RESULT_FIELDS
+                self.csv = csv.DictWriter(self.f, fieldnames=fields, extrasaction="ignore")
+            if not self.header_written:
+                self.csv.writeheader()
+                self.header_written = True
+            for row in rows:
+                if isinstance(row.get("logs"), list): row["logs"] = " | ".join(row["logs"])
+                self.csv.writerow(row)
+        else:
+            self.f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        self.f.flush()
+
+    def close(self):
+        if self.f is not sys.stdout: self.f.close()
+
+
+def _chunks(records, size):
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk: return
+        yield chunk
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+def run(input_path, output_path, input_format=None, output_format=None, workers=None, chunk_size=10000,
+        resume=False, with_logs=False, progress=sys.stderr):
+    input_format = _detect_format(input_path, input_format)
+    output_format = _detect_format(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+
+    skip = count_done(output_path) if resume and output_path != "-" else 0
+    records = read_records(input_path, input_format)
+    input_fields = None
+    if input_format == "csv":
+        first = next(records, None)
+        input_fields = list(first) if first else []
+        records = records if first is None else _prepend(first, records)
+    records = islice(records, skip, None)
+    writer = ResultWriter(output_path, output_format, append=skip > 0, input_fields=input_fields)
+
+    done = skip
+    started = time.perf_counter()
+
+    def report(rows):
+        nonlocal done
+        writer.write(rows)
+        done += len(rows)
+        if progress:
+            elapsed = time.perf_counter() - started
+            rate = (done - skip) / elapsed if elapsed else 0
+            print(f"\r{done:,}건 완료 ({rate:,.0f}건/초)", end="", file=progress, flush=True)
+
+    try:
+        if workers == 1:
+            for chunk in _chunks(records, chunk_size):
+                report(_analyze_chunk((chunk, with_logs)))
+        else:
+            # 처리 중인 chunk 는 워커 수의 2배까지만 -> 메모리 상한
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in _chunks(records, chunk_size):
+                    pending.append(pool.submit(_analyze_chunk, (chunk, with_logs)))
+                    if len(pending) >= workers * 2:
+                        report(pending.popleft().result())
+                while pending:
+                    report(pending.popleft().result())
+    finally:
+        writer.close()
+        if progress: print(file=progress)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m saju", description="생년월일 파일(CSV/JSONL)을 대량으로 분석합니다.")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl, '-' 는 표준입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (.csv 또는 .jsonl, 기본: 표준출력)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("-w", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--resume", action="store_true", help="출력 파일에 이미 있는 레코드는 건너뛰고 이어서 쓴다")
+    parser.add_argument("--logs", action="store_true", help="오행 세력 전쟁 로그도 출력")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.output, args.input_format, args.output_format, args.workers, args.chunk_size,
+        args.resume, args.logs, progress=None if args.quiet else sys.stderr)
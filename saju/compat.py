@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .calculator import SajuCalculator
+from .rules import RULES
+from .tables import GAN_ELEM, GEUK, SAENG
+
+# ---------------------------------------------------------
+# [궁합] 두 원국의 궁합 점수 + 대량 top-k 매칭
+# ---------------------------------------------------------
+# 점수 = BASE
+#      + 오행 보완    : WEIGHTS["element"] x (1 - 두 오행 점수 벡터의 코사인)  (내게 부족한 기운을 채워 줄수록 높다)
+#      + 일간 관계    : 천간합 +stem_hap, 천간충 -감점 x stem_chung
+#      + 일지 관계    : 지지충 -점수 x branch_chung, 같은 삼합/방합에 드는 두 지지 +hap3_scores[2] x branch_hap3
+#      + 일간 오행    : 상생(어느 쪽이든) +saeng, 같은 오행 +same, 상극(어느 쪽이든) -geuk
+# 일간/일지/오행 관계는 두 일주(60 x 60)만으로 정해지므로 표 하나(day_table)로 미리 만든다.
+#
+# 대량 계산: 사람마다 65차원 특징(오행 단위벡터 5 + 일주 60)을 만들어 두면
+#   점수 = BASE + W + (-W x 단위벡터_i, day_table[일주_i]) · (단위벡터_j, 원-핫(일주_j))
+# 라서 블록 하나가 행렬곱 한 번이다. 사용자 블록 x 후보 블록 단위로 계산하면서 top-k 만 남기므로
+# N x M 전체 행렬은 만들지 않고, 사용자 블록은 프로세스 풀에 나눠 준다.
+BASE = 50.0
+WEIGHTS = {
+    "element": 40.0, "stem_hap": 20.0, "stem_chung": 2.0, "branch_chung": 2.0, "branch_hap3": 2.0,
+    "saeng": 10.0, "same": 5.0, "geuk": 10.0,
+}
+
+
+def build_day_table(rules=RULES, weights=WEIGHTS):
+    """일주 x 일주 -> 일간/일지/일간 오행 관계 점수 (60 x 60, float32)"""
+    stem = np.zeros((10, 10))
+    for _, (a, b), _, _ in rules.hap:
+        stem[a, b] = stem[b, a] = weights["stem_hap"]
+    stem -= np.array(rules.chung_penalty) * weights["stem_chung"]
+    for a in range(10):
+        for b in range(10):
+            ea, eb = GAN_ELEM[a], GAN_ELEM[b]
+            if ea == eb: stem[a, b] += weights["same"]
+            elif SAENG[ea] == eb or SAENG[eb] == ea: stem[a, b] += weights["saeng"]
+            elif GEUK[ea] == eb or GEUK[eb] == ea: stem[a, b] -= weights["geuk"]
+
+    branch = np.zeros((12, 12))
+    for _, (a, b), _, _, _, sc in rules.jiji_chung:
+        branch[a, b] = branch[b, a] = -sc * weights["branch_chung"]
+    bonus = rules.hap3_scores.get(2, 0) * weights["branch_hap3"]
+    for _, members, _, _ in rules.hap3:
+        for a in members:
+            for b in members:
+                if a != b: branch[a, b] += bonus
+
+    codes = np.arange(60)
+    return (stem[np.ix_(codes % 10, codes % 10)] + branch[np.ix_(codes % 12, codes % 12)]).astype(np.float32)
+
+
+class CompatibilityEngine:
+    def __init__(self, calc=None, weights=None):
+        self.calc = calc or SajuCalculator()
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.day_table = build_day_table(self.calc.rules, self.weights)
+
+    # -----------------------------------------------------
+    # 특징
+    # -----------------------------------------------------
+    def element_vectors(self, codes):
+        """원국 코드 (N x 4, 시간 모름 -1) -> calculate_weighted_scores 오행 점수 (N x 5). 같은 원국은 한 번만 계산"""
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, 4)
+        uniq, inverse = np.unique(codes, axis=0, return_inverse=True)
+        scores = np.array([self.calc.score_codes(tuple(map(int, c)))[0] for c in uniq], dtype=np.float32)
+        return scores.reshape(-1, 5)[inverse.reshape(-1)]
+
+    @staticmethod
+    def unit_vectors(element_scores):
+        # 음수 점수는 0 으로 보고 길이 1 로 정규화 (전부 0 이면 0 벡터)
+        v = np.maximum(np.asarray(element_scores, dtype=np.float32), 0)
+        norm = np.linalg.norm(v, axis=1, keepdims=True)
+        return np.divide(v, norm, out=np.zeros_like(v), where=norm > 0)
+
+    def user_features(self, codes):
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, 4)
+        unit = self.unit_vectors(self.element_vectors(codes))
+        return np.hstack([-self.weights["element"] * unit, self.day_table[codes[:, 2]]]).astype(np.float32)
+
+    def candidate_features(self, codes):
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, 4)
+        unit = self.unit_vectors(self.element_vectors(codes))
+        onehot = np.zeros((len(codes), 60), dtype=np.float32)
+        onehot[np.arange(len(codes)), codes[:, 2]] = 1
+        return np.hstack([unit, onehot]).astype(np.float32)
+
+    @property
+    def offset(self): return BASE + self.weights["element"]
+
+    # -----------------------------------------------------
+    # 한 쌍 (설명용)
+    # -----------------------------------------------------
+    def score_pair(self, codes_a, codes_b):
+        """두 원국 코드 -> {"score", "element", "day"} (element/day 는 점수 구성)"""
+        vectors = self.unit_vectors(self.element_vectors([codes_a, codes_b]))
+        element = self.weights["element"] * (1 - float(vectors[0] @ vectors[1]))
+        day = float(self.day_table[codes_a[2], codes_b[2]])
+        return {"score": BASE + element + day, "element": element, "day": day}
+
+    def score_matrix(self, users, candidates):
+        """작은 N x M 용 전체 점수 행렬"""
+        return self.offset + self.user_features(users) @ self.candidate_features(candidates).T
+
+    # -----------------------------------------------------
+    # 대량 top-k
+    # -----------------------------------------------------
+    def top_k(self, users, candidates, k=10, exclude_self=False, user_block=1024, candidate_block=16384, workers=None):
+        """사용자마다 점수 높은 후보 k 명 -> (후보 번호 N x k int64, 점수 N x k float32), 점수 내림차순
+
+        exclude_self=True 면 users 와 candidates 가 같은 명단이라 보고 자기 자신(i == j)은 뺀다.
+        """
+        user_feats = self.user_features(users)
+        cand_feats = self.candidate_features(candidates)
+        k = min(k, len(cand_feats) - (1 if exclude_self else 0))
+        # k <= 0 이면 argpartition(-0) 이 모든 열을 남기므로 여기서 빈 결과를 돌려준다
+        if k <= 0: return np.zeros((len(user_feats), 0), dtype=np.int64), np.zeros((len(user_feats), 0), dtype=np.float32)
+        starts = range(0, len(user_feats), user_block)
+        args = [(user_feats[s:s + user_block], s if exclude_self else None) for s in starts]
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1 or len(args) == 1:
+            _init_worker(cand_feats, k, candidate_block, self.offset)
+            parts = [_top_k_block(a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(cand_feats, k, candidate_block, self.offset)) as pool:
+                parts = list(pool.map(_top_k_block, args))
+        if not parts: return np.zeros((0, k), dtype=np.int64), np.zeros((0, k), dtype=np.float32)
+        return np.vstack([p[0] for p in parts]), np.vstack([p[1] for p in parts])
+
+
+# 워커 프로세스마다 후보 특징은 한 번만 받는다
+_worker = {}
+
+
+def _init_worker(cand_feats, k, candidate_block, offset):
+    _worker.update(cands=cand_feats, k=k, block=candidate_block, offset=offset)
+
+
+def _top_k_block(args):
+    user_feats, self_start = args
+    cands, k, block, offset = _worker["cands"], _worker["k"], _worker["block"], _worker["offset"]
+    rows = np.arange(len(user_feats))
+    best_idx = np.zeros((len(user_feats), 0), dtype=np.int64)
+    best = np.zeros((len(user_feats), 0), dtype=np.float32)
+    for start in range(0, len(cands), block):
+        scores = user_feats @ cands[start:start + block].T
+        if self_start is not None:
+            cols = rows + self_start - start
+            hit = (cols >= 0) & (cols < scores.shape[1])
+            scores[rows[hit], cols[hit]] = -np.inf
+        if scores.shape[1] > k:
+            part = np.argpartition(scores, -k, axis=1)[:, -k:]
+            scores = np.take_along_axis(scores, part, axis=1)
+        else:
+            part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        best = np.hstack([best, scores])
+        best_idx = np.hstack([best_idx, part + start])
+        if best.shape[1] > k:
+            keep = np.argpartition(best, -k, axis=1)[:, -k:]
+            best = np.take_along_axis(best, keep, axis=1)
+            best_idx = np.take_along_axis(best_idx, keep, axis=1)
+    order = np.argsort(-best, axis=1, kind="stable")
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best, order, axis=1) + offset
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+# ---------------------------------------------------------
+# [부하 생성기] saju.server 처리량 / 지연 시간 측정
+# ---------------------------------------------------------
+#   python -m saju.server --port 8000 &
+#   python -m saju.loadgen http://127.0.0.1:8000 --requests 20000 --concurrency 64
+#
+# 연결(keep-alive)마다 코루틴 하나가 요청을 차례로 보낸다. 생년월일은 고정 시드로 만들고
+# --unique 로 서로 다른 입력 수를 정해 캐시 적중률을 조절한다 (0 이면 전부 다른 입력).
+
+
+def make_payloads(n, unique, seed):
+    rng = random.Random(seed)
+    start = date(1950, 1, 1)
+    pool = n if unique <= 0 else unique
+    items = []
+    for _ in range(pool):
+        item = {"birth_date": (start + timedelta(days=rng.randrange(80 * 365))).isoformat()}
+        if rng.random() < 0.8: item["birth_time"] = f"{rng.randrange(24):02d}:{rng.randrange(60):02d}"
+        items.append(json.dumps(item).encode("utf-8"))
+    return items if unique <= 0 else [rng.choice(items) for _ in range(n)]
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line: raise ConnectionError("서버가 연결을 끊었습니다")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""): break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length": length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, path, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while payloads:
+            body = payloads.pop()
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            started = time.perf_counter()
+            writer.write(request)
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200: errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values: return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+async def run(url, requests=10000, concurrency=64, unique=0, seed=42):
+    parts = urlsplit(url)
+    payloads = make_payloads(requests, unique, seed)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(parts.hostname, parts.port or 80, "/analyze", payloads, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies), "errors": len(errors), "concurrency": concurrency, "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        **{f"p{q}_ms": round(percentile(latencies, q) * 1000, 3) for q in (50, 90, 99)},
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m saju.loadgen", description="saju.server 부하 테스트")
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:8000")
+    parser.add_argument("-n", "--requests", type=int, default=10000)
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="동시 연결 수")
+    parser.add_argument("--unique", type=int, default=0, help="서로 다른 입력 수 (0 이면 모두 다름)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args.url, args.requests, args.concurrency, args.unique, args.seed))
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
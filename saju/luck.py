@@ -0,0 +1,169 @@
+from datetime import datetime, time
+
+from .calculator import SajuCalculator, apply_battle, pre_battle_state, render_battle_log
+from .solar_terms import get_solar_terms
+from .tables import ELEMENTS, GAN, GAN_ELEM, GAN_POL, GANJI, JI, JI_ELEM, LUCK_WEIGHTS, SUPPORT
+
+# ---------------------------------------------------------
+# [운] 대운(10년) / 세운(1년) 타임라인
+# ---------------------------------------------------------
+# 대운: 월주에서 출발해 60갑자를 순행(+1) 또는 역행(-1)으로 하나씩 옮긴 기둥이 10년씩 이어진다.
+#   순행 = 양년생 남자, 음년생 여자 / 역행 = 그 반대 (연간의 음양 기준)
+#   대운수(첫 대운 나이) = 태어난 시각부터 다음(순행)/직전(역행) 절기까지 일수 / 3 (반올림, 최소 1)
+# 세운: 그 해의 연주 ((연도 - 1984) % 60). 나이는 (연도 - 태어난 해).
+#
+# 점수는 처음부터 다시 계산하지 않는다. 원국의 Step 1~6 상태(pre_battle_state)를 한 번 만들고
+# 운 기둥의 효과만 더한 뒤 Step 7(세력전쟁)만 다시 한다.
+#   - 기본 점수(LUCK_WEIGHTS), 일간과의 천간충
+#   - 천간합/지지충/삼합·방합: (기존 마스크 | 운 기둥) 의 규칙 결과 - 기존 마스크의 규칙 결과
+#   - 병존은 붙어 있는 원국 기둥끼리만 보므로 운에는 없다
+# 세운은 그 해 대운까지 더한 상태 위에 얹는다. 로그에는 운 때문에 생긴 사건과 세력전쟁만 담는다.
+MALE = {"남", "남성", "남자", "m", "male"}
+DEFAULT_START_AGE = 5  # 절기표 범위(1900~2100) 밖이면 평균값
+
+
+def daeun_direction(year_code, gender):
+    is_male = str(gender).strip().lower() in MALE
+    return 1 if (GAN_POL[year_code % 10] == 0) == is_male else -1
+
+
+def daeun_start_age(moment, direction):
+    """태어난 시각(한국 시각) -> 첫 대운 나이"""
+    terms = get_solar_terms()
+    idx = terms.term_index(moment)
+    if idx is None: return DEFAULT_START_AGE
+    target = terms.term_moment(idx + 1 if direction > 0 else idx)
+    days = abs((target - moment).total_seconds()) / 86400
+    return max(1, int(days / 3 + 0.5))
+
+
+def apply_luck_pillar(state, code, weights, day_stem, rules, logs=None):
+    """(오행 점수, 지지 오행 점수, 신강 점수, 천간 마스크, 지지 마스크) 에 운 기둥 하나를 더한 새 상태"""
+    scores, jiji, strength, stem_mask, branch_mask = state
+    scores, jiji = list(scores), list(jiji)
+    my_element = GAN_ELEM[day_stem]
+    support = SUPPORT[my_element]
+    stem, branch = code % 10, code % 12
+
+    # 기본 점수
+    w_stem, w_branch = weights
+    elem = GAN_ELEM[stem]
+    scores[elem] += w_stem
+    strength += support[elem] * w_stem
+    elem = JI_ELEM[branch]
+    scores[elem] += w_branch
+    jiji[elem] += w_branch
+    strength += support[elem] * w_branch
+
+    # 천간충 (일간 vs 운의 천간)
+    penalty = rules.chung_penalty[day_stem][stem]
+    if penalty:
+        scores[my_element] -= penalty
+        strength -= penalty
+        if logs is not None: logs.append(f"💥 천간충 ({GAN[day_stem]} 💥 {GAN[stem]})! 내 기운 -{penalty}")
+
+    # 천간합: 새로 성립한 합만
+    new_mask = stem_mask | 1 << stem
+    if new_mask != stem_mask:
+        fired0, deltas0, gains0 = rules.stem_events(stem_mask)
+        fired1, deltas1, gains1 = rules.stem_events(new_mask)
+        if fired1 != fired0:
+            for e in range(5):
+                scores[e] += deltas1[e] - deltas0[e]
+                strength += support[e] * (gains1[e] - gains0[e])
+            if logs is not None:
+                for k, (_, pair, _, _) in enumerate(rules.hap):
+                    if (fired1 & ~fired0) >> (rules.hap_bit + k) & 1:
+                        logs.append(f"💖 천간합 ({' ❤️ '.join(GAN[s] for s in pair)}) 성립!")
+        stem_mask = new_mask
+
+    # 지지충 / 삼합·방합: 새로 성립했거나 강해진 것만
+    new_mask = branch_mask | 1 << branch
+    if new_mask != branch_mask:
+        chung0, _, adds0 = rules.branch_events(branch_mask)
+        chung1, _, adds1 = rules.branch_events(new_mask)
+        had = {k for k, _, _, _ in chung0}
+        for k, e1, e2, sc in chung1:
+            if k in had: continue
+            w, l = (e1, e2) if jiji[e1] >= jiji[e2] else (e2, e1)
+            scores[w] += sc
+            scores[l] -= sc
+            strength += support[w] * sc - support[l] * sc
+            if logs is not None:
+                pair = rules.jiji_chung[k][1]
+                logs.append(f"⚔️ 지지충 ({JI[pair[0]]} 💥 {JI[pair[1]]})! 승자:{ELEMENTS[w]}(+{sc})")
+        if adds1 != adds0:
+            for e in range(5):
+                scores[e] += adds1[e] - adds0[e]
+                strength += support[e] * (adds1[e] - adds0[e])
+            if logs is not None:
+                for name, members, mask, _ in rules.hap3:
+                    before = rules.hap3_scores.get((branch_mask & mask).bit_count(), 0)
+                    after = rules.hap3_scores.get((new_mask & mask).bit_count(), 0)
+                    if after > before:
+                        matched = ",".join(JI[b] for b in members if new_mask >> b & 1)
+                        logs.append(f"🌀 {name} ({matched}) +{after - before}")
+        branch_mask = new_mask
+
+    return tuple(scores), tuple(jiji), strength, stem_mask, branch_mask
+
+
+def _period(calc, kind, state, code, my_element, logs, **info):
+    scores = list(state[0])
+    strength, battle = apply_battle(scores, state[2], my_element)
+    if logs is not None and battle: logs.append(render_battle_log(battle))
+    return dict(
+        kind=kind, **info, code=code, pillar=GANJI[code],
+        element_scores=dict(zip(ELEMENTS, scores)), strength=strength,
+        power_desc=calc.get_power_desc(strength), logs=logs,
+    )
+
+
+def iter_timeline(birth_date, hour=None, minute=0, gender="남성", years=100, calc=None, with_logs=True):
+    """나이 순서로 대운/세운 dict 를 하나씩 만들어 낸다 (대운이 바뀌는 해에는 대운 -> 세운 순서)
+
+    대운: kind="대운", index(1~), age(시작 나이), end_age, year / 세운: kind="세운", age, year, daeun(대운 간지 또는 None)
+    공통: code, pillar, element_scores, strength, power_desc, logs
+    """
+    calc = calc or SajuCalculator()
+    rules = calc.rules
+    codes = calc.get_pillar_codes(birth_date, hour, minute)
+    day_stem = codes[2] % 10
+    my_element = GAN_ELEM[day_stem]
+    direction = daeun_direction(codes[0], gender)
+    moment = datetime.combine(birth_date, time(12) if hour is None else time(hour, minute))
+    start_age = daeun_start_age(moment, direction)
+
+    scores, jiji, strength, _, stem_mask, branch_mask = pre_battle_state(codes, rules)
+    natal = (tuple(scores), tuple(jiji), strength, stem_mask, branch_mask)
+    current, daeun = natal, None
+    for age in range(years):
+        year = birth_date.year + age
+        if age >= start_age and (age - start_age) % 10 == 0:
+            index = (age - start_age) // 10 + 1
+            code = (codes[1] + direction * index) % 60
+            logs = [] if with_logs else None
+            current = apply_luck_pillar(natal, code, LUCK_WEIGHTS["대운"], day_stem, rules, logs)
+            daeun = GANJI[code]
+            yield _period(calc, "대운", current, code, my_element, logs,
+                          index=index, age=age, end_age=age + 9, year=year)
+        code = (year - 1984) % 60
+        logs = [] if with_logs else None
+        state = apply_luck_pillar(current, code, LUCK_WEIGHTS["세운"], day_stem, rules, logs)
+        yield _period(calc, "세운", state, code, my_element, logs, age=age, year=year, daeun=daeun)
+
+
+def timeline(birth_date, hour=None, minute=0, gender="남성", years=100, calc=None, with_logs=True):
+    return list(iter_timeline(birth_date, hour, minute, gender, years, calc, with_logs))
+
+
+def iter_decades(birth_date, hour=None, minute=0, gender="남성", years=100, calc=None, with_logs=True):
+    """(대운 dict 또는 None(대운 전), 그 기간의 세운 dict 목록) 을 대운 단위로 하나씩 (화면에서 앞부터 그리기용)"""
+    daeun, seun = None, []
+    for period in iter_timeline(birth_date, hour, minute, gender, years, calc, with_logs):
+        if period["kind"] == "대운":
+            if seun: yield daeun, seun
+            daeun, seun = period, []
+        else:
+            seun.append(period)
+    if seun: yield daeun, seun
@@ -0,0 +1,246 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import lru_cache, wraps
+
+from .tables import BATTLE_DRAIN, BATTLE_REVOLT, BATTLE_SUPPRESS
+
+# ---------------------------------------------------------
+# [계측] 단계별 소요 시간 / 규칙 성립 횟수
+# ---------------------------------------------------------
+# SAJU_METRICS=1 로 실행하면 켜진다. 꺼져 있으면 아무것도 바꿔 끼우지 않으므로 비용이 없다.
+#   - SajuCalculator: 만들 때 instrument() 가 기둥 계산/점수/십성/로그/analyze 를 재는 메서드로 바꾸고,
+#     점수를 새로 계산할 때는 Step 1~7 을 따로 잰다 (캐시 적중은 "score" 에만 잡힌다).
+#   - 화면: @metrics.timed("이름") 데코레이터와 metrics.stage("이름") 블록.
+#   - 합/충/삼합/병존 규칙과 세력전쟁은 점수를 조회할 때마다 센다.
+# 값은 프로세스마다 따로 모은다. snapshot() 은 JSON 용 dict, prometheus() 는 Prometheus 텍스트 형식.
+BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 500000)
+BUCKETS_NS = tuple(b * 1000 for b in BUCKETS_US)
+SCORE_STEPS = (
+    "score.step1_base", "score.step2_stem_chung", "score.step3_stem_hap", "score.step4_branch_chung",
+    "score.step5_hap3", "score.step6_byeongjon", "score.step7_battle",
+)
+BATTLE_NAMES = {BATTLE_SUPPRESS: "제압", BATTLE_REVOLT: "하극상", BATTLE_DRAIN: "설기"}
+
+clock = time.perf_counter_ns
+enabled = os.environ.get("SAJU_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable():
+    # 이후에 만드는 계산기/데코레이터부터 적용된다
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._stages = {}    # 이름 -> [횟수, 합(ns), 최대(ns), 구간별 횟수]
+            self._counters = {}
+            self._rules = {}     # (규칙 이름, 종류) -> 성립 횟수
+            self._battles = {}
+
+    def _observe(self, stage, elapsed_ns):
+        entry = self._stages.get(stage)
+        if entry is None: entry = self._stages[stage] = [0, 0, 0, [0] * (len(BUCKETS_NS) + 1)]
+        entry[0] += 1
+        entry[1] += elapsed_ns
+        if elapsed_ns > entry[2]: entry[2] = elapsed_ns
+        entry[3][bisect_left(BUCKETS_NS, elapsed_ns)] += 1
+
+    def observe(self, stage, elapsed_ns):
+        with self._lock:
+            self._observe(stage, elapsed_ns)
+
+    def observe_marks(self, stages, marks):
+        # marks[i] ~ marks[i + 1] 이 stages[i] 의 시간
+        with self._lock:
+            for i, stage in enumerate(stages):
+                self._observe(stage, marks[i + 1] - marks[i])
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def count_fired(self, rules, codes, fired, battle):
+        ids = rules.fired_rule_ids(codes, fired) if fired else ()
+        with self._lock:
+            for rule_id in ids:
+                key = rules.rule_names[rule_id], rules.rule_kinds[rule_id]
+                self._rules[key] = self._rules.get(key, 0) + 1
+            if battle:
+                name = BATTLE_NAMES[battle // 25]
+                self._battles[name] = self._battles.get(name, 0) + 1
+
+    def _copy(self):
+        with self._lock:
+            stages = {name: (n, total, peak, list(buckets)) for name, (n, total, peak, buckets) in self._stages.items()}
+            return self.started_at, stages, dict(self._counters), dict(self._rules), dict(self._battles)
+
+    # -----------------------------------------------------
+    # 내보내기
+    # -----------------------------------------------------
+    def snapshot(self):
+        """JSON 으로 바로 내보낼 수 있는 dict. 백분위는 히스토그램 구간 상한으로 근사한 값"""
+        started_at, stages, counters, rules, battles = self._copy()
+        kinds = {}
+        for (_, kind), count in rules.items():
+            kinds[kind] = kinds.get(kind, 0) + count
+        return {
+            "enabled": enabled,
+            "pid": os.getpid(),
+            "started_at": round(started_at, 3),
+            "uptime_s": round(time.time() - started_at, 3),
+            "stages": {name: _summarize(*stats) for name, stats in sorted(stages.items())},
+            "counters": counters,
+            "rules": [{"rule": rule, "kind": kind, "count": count}
+                      for (rule, kind), count in sorted(rules.items(), key=lambda item: -item[1])],
+            "rule_kinds": kinds,
+            "battles": battles,
+        }
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        started_at, stages, counters, rules, battles = self._copy()
+        lines = [
+            "# HELP saju_stage_duration_seconds 단계별 소요 시간",
+            "# TYPE saju_stage_duration_seconds histogram",
+        ]
+        for name, (n, total, _, buckets) in sorted(stages.items()):
+            stage = _label(name)
+            cumulative = 0
+            for bound, count in zip(BUCKETS_US, buckets):
+                cumulative += count
+                lines.append(f'saju_stage_duration_seconds_bucket{{stage="{stage}",le="{bound / 1e6:g}"}} {cumulative}')
+            lines.append(f'saju_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {n}')
+            lines.append(f'saju_stage_duration_seconds_sum{{stage="{stage}"}} {total / 1e9:.9f}')
+            lines.append(f'saju_stage_duration_seconds_count{{stage="{stage}"}} {n}')
+        lines += ["# HELP saju_events_total 계측 카운터", "# TYPE saju_events_total counter"]
+        lines += [f'saju_events_total{{event="{_label(name)}"}} {count}' for name, count in sorted(counters.items())]
+        lines += ["# HELP saju_rule_fired_total 합/충/삼합/병존 규칙이 성립한 횟수", "# TYPE saju_rule_fired_total counter"]
+        lines += [f'saju_rule_fired_total{{rule="{_label(rule)}",kind="{_label(kind)}"}} {count}'
+                  for (rule, kind), count in sorted(rules.items())]
+        lines += ["# HELP saju_battle_total 세력전쟁 종류별 횟수", "# TYPE saju_battle_total counter"]
+        lines += [f'saju_battle_total{{kind="{_label(kind)}"}} {count}' for kind, count in sorted(battles.items())]
+        lines += ["# HELP saju_metrics_start_time_seconds 계측 시작(또는 초기화) 시각", "# TYPE saju_metrics_start_time_seconds gauge",
+                  f"saju_metrics_start_time_seconds {started_at:.3f}"]
+        return "\n".join(lines) + "\n"
+
+
+def _summarize(n, total, peak, buckets):
+    def pct(q):
+        target, cumulative = q / 100 * n, 0
+        for bound, count in zip(BUCKETS_US, buckets):
+            cumulative += count
+            if cumulative >= target: return min(bound, peak / 1000)
+        return peak / 1000
+
+    return {
+        "count": n, "total_ms": round(total / 1e6, 3), "mean_us": round(total / n / 1000, 3),
+        "p50_us": round(pct(50), 3), "p90_us": round(pct(90), 3), "p99_us": round(pct(99), 3),
+        "max_us": round(peak / 1000, 3),
+    }
+
+
+def _label(value): return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+observe = REGISTRY.observe
+snapshot = REGISTRY.snapshot
+prometheus = REGISTRY.prometheus
+reset = REGISTRY.reset
+
+
+# ---------------------------------------------------------
+# 계측 붙이기
+# ---------------------------------------------------------
+def _wrap(stage, fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            REGISTRY.observe(stage, clock() - t0)
+    return wrapper
+
+
+def timed(stage):
+    """함수 실행 시간을 stage 이름으로 기록하는 데코레이터. 꺼져 있으면 함수를 그대로 돌려준다"""
+    def decorate(fn): return _wrap(stage, fn) if enabled else fn
+    return decorate
+
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name): self.name = name
+
+    def __enter__(self):
+        self.started = clock()
+        return self
+
+    def __exit__(self, *exc): REGISTRY.observe(self.name, clock() - self.started)
+
+
+_NULL_STAGE = nullcontext()
+
+
+def stage(name):
+    """with metrics.stage("이름"): ... 블록 시간 기록. 꺼져 있으면 아무것도 하지 않는 컨텍스트"""
+    return _Stage(name) if enabled else _NULL_STAGE
+
+
+def instrument(calc):
+    """SajuCalculator 인스턴스의 메서드를 계측 버전으로 바꿔 끼운다 (클래스와 다른 인스턴스는 그대로)"""
+    from .calculator import apply_battle, pre_battle_state
+    from .tables import GAN_ELEM
+
+    rules = calc.rules
+
+    def score_uncached(codes):
+        # SajuCalculator._score_uncached 와 같은 계산을 Step 별 시각을 찍으며 한다
+        if calc.score_table is not None:
+            t0 = clock()
+            result = calc.score_table.lookup(codes)
+            if result is not None:
+                REGISTRY.observe("score.table_lookup", clock() - t0)
+                REGISTRY.incr("score.table_hits")
+                return result
+        marks = [clock()]
+        element_scores, _, strength, fired, _, _ = pre_battle_state(codes, rules, marks)
+        my_element = GAN_ELEM[codes[2] % 10]
+        strength, battle = apply_battle(element_scores, strength, my_element)
+        marks.append(clock())
+        REGISTRY.observe_marks(SCORE_STEPS, marks)
+        REGISTRY.incr("score.computed")
+        return tuple(element_scores), strength, my_element, fired, battle
+
+    calc._cached_score = lru_cache(maxsize=calc.cache_size)(score_uncached)
+
+    timed_score = _wrap("score", calc.score_codes)
+
+    @wraps(timed_score)
+    def score_codes(codes):
+        result = timed_score(codes)
+        REGISTRY.count_fired(rules, codes, result[3], result[4])
+        return result
+
+    calc.score_codes = score_codes
+    for name, stage_name in (("get_pillar_codes", "pillars"), ("sibseong_codes", "sibseong"),
+                             ("render_logs", "logs"), ("analyze", "analyze")):
+        setattr(calc, name, _wrap(stage_name, getattr(calc, name)))
+    return calc
@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from .batch import SajuBatchCalculator
+from .calculator import SajuCalculator
+from .rules import RULES
+from .tables import GAN, GANJI_INDEX, JI, POWER_DESCS, POWER_THRESHOLDS
+
+
+# ---------------------------------------------------------
+# [역색인] 기둥/규칙/신강 구간 -> 생년월일시 목록
+# ---------------------------------------------------------
+# 기간 안의 모든 날짜 x 시진을 "슬롯" 하나로 보고 (슬롯 번호 = 시작일부터의 일수 * 13 + 칸),
+# 특징(연/월/일/시주 번호, 성립한 합/충 규칙, 신강 구간)마다 그 특징을 가진 슬롯 번호를 정렬해 저장한다.
+# 질의는 조건별 목록을 짧은 것부터 np.searchsorted 로 교집합 -> 몇 ms 안에 끝난다.
+#
+# 저장 형식 (디렉터리 하나): offsets.npy (특징 키별 시작 위치), postings.npy (슬롯 번호 int32), meta.json
+# np.load(mmap_mode="r") 로 열기 때문에 여러 프로세스가 같은 페이지를 공유한다.
+#   생성: python -m saju.pillar_index build index_dir --start 1950 --end 2030
+#   질의: python -m saju.pillar_index query index_dir --day 신사 --rule 자오충
+#
+# SajuCalculator 와 같이 자시는 날짜를 넘기지 않는다: 23시 ~ 24시(야자시)도 그날의 일주/자시로 본다.
+# 그래서 하루를 13칸으로 나눈다. 칸 0 = 0시 ~ 1시, 칸 k(1~11) = (2k-1)시 ~ (2k+1)시, 칸 12 = 23시 ~ 24시.
+# 칸 0 과 12 는 시주가 같지만 절기가 그날 바뀌면 연/월주가 다를 수 있어 따로 둔다.
+# 연/월주는 칸 한가운데 시각 기준이라 절기가 칸 중간에 드는 경우 그 슬롯은 한쪽 월로만 들어간다.
+PILLARS = ("year", "month", "day", "time")
+FORMAT_VERSION = 2
+SLOTS_PER_DAY = 13
+SLOT_STARTS = (0, *range(1, 23, 2), 23)                      # 칸별 시작 시각 (시)
+SLOT_HOURS = (0, *range(2, 23, 2), 23)                       # 연/월주를 구하는 시각 (칸 한가운데)
+SLOT_MINUTES = (30, *[0] * 11, 30)
+
+
+def _key_layout(n_rules):
+    # 특징 종류 -> (키 시작 위치, 개수)
+    sizes = [(name, 60) for name in PILLARS] + [("rule", n_rules), ("power", len(POWER_DESCS))]
+    layout, offset = {}, 0
+    for name, size in sizes:
+        layout[name] = (offset, size)
+        offset += size
+    return layout
+
+
+def _intersect(a, b):
+    # 정렬된 a, b 의 교집합 (a 가 짧은 쪽)
+    if not len(a) or not len(b): return a[:0]
+    pos = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[pos] == a]
+
+
+class PillarIndex:
+    def __init__(self, offsets, postings, meta):
+        self.offsets = offsets
+        self.postings = postings
+        self.meta = meta
+        self.start = date.fromisoformat(meta["start"])
+        self.days = meta["days"]
+        self.layout = {name: tuple(v) for name, v in meta["layout"].items()}
+        self.rule_ids = {name: i for i, name in enumerate(meta["rule_names"])}
+
+    @classmethod
+    def load(cls, path, rules=RULES):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != FORMAT_VERSION: raise ValueError(f"역색인 형식이 맞지 않습니다: {path}")
+        if meta["rules_version"] != rules.version:
+            raise ValueError(f"역색인 규칙 버전({meta['rules_version']})이 현재 규칙({rules.version})과 다릅니다")
+        if meta.get("power_thresholds") != list(POWER_THRESHOLDS):
+            raise ValueError(f"역색인의 신강 구간 경계({meta.get('power_thresholds')})가 현재({list(POWER_THRESHOLDS)})와 다릅니다")
+        offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        return cls(offsets, postings, meta)
+
+    # -----------------------------------------------------
+    # 조건 -> 특징 키
+    # -----------------------------------------------------
+    @staticmethod
+    def _pillar_codes(value):
+        # "신사" 또는 60갑자 번호
+        if isinstance(value, str):
+            if value not in GANJI_INDEX: raise ValueError(f"알 수 없는 간지: {value}")
+            return [GANJI_INDEX[value]]
+        return [int(value)]
+
+    @staticmethod
+    def _stem_codes(value):
+        stem = GAN.index(value) if isinstance(value, str) else int(value)
+        return [code for code in range(60) if code % 10 == stem]
+
+    @staticmethod
+    def _branch_codes(value):
+        branch = JI.index(value) if isinstance(value, str) else int(value)
+        return [code for code in range(60) if code % 12 == branch]
+
+    def _criteria_keys(self, criteria):
+        # 조건 하나 = 특징 키 목록 (키끼리는 OR), 조건끼리는 AND
+        groups = []
+        for name, value in criteria.items():
+            if value is None: continue
+            pillar, _, part = name.partition("_")
+            if pillar in PILLARS:
+                codes = {"": self._pillar_codes, "stem": self._stem_codes, "branch": self._branch_codes}[part](value)
+                offset = self.layout[pillar][0]
+                groups.append([offset + code for code in codes])
+            elif name == "rules":
+                for rule in ([value] if isinstance(value, str) else value):
+                    if rule not in self.rule_ids: raise ValueError(f"알 수 없는 규칙: {rule}")
+                    groups.append([self.layout["rule"][0] + self.rule_ids[rule]])
+            elif name == "power":
+                bucket = POWER_DESCS.index(value) if isinstance(value, str) else int(value)
+                groups.append([self.layout["power"][0] + bucket])
+            else:
+                raise TypeError(f"알 수 없는 조건: {name}")
+        return groups
+
+    def _postings(self, keys):
+        if len(keys) == 1: return self.postings[self.offsets[keys[0]]:self.offsets[keys[0] + 1]]
+        return np.sort(np.concatenate([self.postings[self.offsets[k]:self.offsets[k + 1]] for k in keys]))
+
+    # -----------------------------------------------------
+    # 질의
+    # -----------------------------------------------------
+    def query(self, start=None, end=None, **criteria):
+        """조건을 모두 만족하는 슬롯 번호 (정렬됨). start/end 는 날짜 범위 (end 포함)
+
+        조건: year/month/day/time="신사" (또는 번호), day_stem="신", month_branch="인" 처럼 천간/지지만,
+        rules=["자오충", ...] (모두 성립), power="신강"
+        """
+        lists = [self._postings(keys) for keys in self._criteria_keys(criteria)]
+        if lists:
+            lists.sort(key=len)
+            result = lists[0]
+            for other in lists[1:]:
+                result = _intersect(result, other)
+        else:
+            result = np.arange(self.days * SLOTS_PER_DAY, dtype=np.int32)
+        if start is not None or end is not None:
+            lo = 0 if start is None else max(0, (start - self.start).days * SLOTS_PER_DAY)
+            hi = self.days * SLOTS_PER_DAY if end is None else max(0, (end - self.start).days + 1) * SLOTS_PER_DAY
+            result = result[np.searchsorted(result, lo):np.searchsorted(result, hi)]
+        return np.asarray(result)
+
+    def slot_start(self, slot):
+        day, k = divmod(int(slot), SLOTS_PER_DAY)
+        return datetime.combine(self.start, datetime.min.time()) + timedelta(days=day, hours=SLOT_STARTS[k])
+
+    def slot_end(self, slot):
+        # 다음 칸의 시작 (칸 12 의 끝 = 다음 날 0시)
+        return self.slot_start(int(slot) + 1)
+
+    def to_ranges(self, slots):
+        """슬롯 번호 -> 이어지는 구간끼리 묶은 [(시작 시각, 끝 시각)] (끝은 미포함)"""
+        if not len(slots): return []
+        slots = np.asarray(slots)
+        breaks = np.flatnonzero(np.diff(slots) != 1) + 1
+        firsts = np.concatenate(([slots[0]], slots[breaks]))
+        lasts = np.concatenate((slots[breaks - 1], [slots[-1]]))
+        return [(self.slot_start(a), self.slot_end(b)) for a, b in zip(firsts, lasts)]
+
+    def find(self, start=None, end=None, **criteria):
+        return self.to_ranges(self.query(start, end, **criteria))
+
+    def to_dates(self, slots):
+        """슬롯 번호 -> 날짜 목록 (중복 제거)"""
+        days = np.unique(np.asarray(slots) // SLOTS_PER_DAY)
+        return [self.start + timedelta(days=int(d)) for d in days]
+
+
+# ---------------------------------------------------------
+# 생성
+# ---------------------------------------------------------
+def build(path, start_year=1950, end_year=2030, rules=RULES):
+    start = date(start_year, 1, 1)
+    n_days = (date(end_year + 1, 1, 1) - start).days
+    layout = _key_layout(len(rules.rule_names))
+
+    batch = SajuBatchCalculator()
+    dates = np.repeat(np.datetime64(start, "D") + np.arange(n_days), SLOTS_PER_DAY)
+    hours = np.tile(SLOT_HOURS, n_days)
+    minutes = np.tile(SLOT_MINUTES, n_days)
+    pillars = [p.astype(np.int64) for p in batch.get_four_pillars(dates, hours, minutes)]
+
+    # 점수는 서로 다른 원국마다 한 번만 계산
+    combo_keys = ((pillars[0] * 12 + (pillars[1] % 12 - 2) % 12) * 60 + pillars[2]) * 12 + pillars[3] % 12
+    _, first_slot, inverse = np.unique(combo_keys, return_index=True, return_inverse=True)
+    calc = SajuCalculator(rules=rules)
+    fires = np.zeros((len(first_slot), len(rules.rule_names)), dtype=bool)
+    buckets = np.zeros(len(first_slot), dtype=np.int64)
+    for i, slot in enumerate(first_slot):
+        codes = tuple(int(p[slot]) for p in pillars)
+        _, strength, _, fired, _ = calc.score_codes(codes)
+        fires[i, list(rules.fired_rule_ids(codes, fired))] = True
+        buckets[i] = calc.get_power_bucket(strength)
+
+    lists = []
+    for name, values in [(name, p) for name, p in zip(PILLARS, pillars)] + [("power", buckets[inverse])]:
+        order = np.argsort(values, kind="stable")
+        counts = np.bincount(values, minlength=layout[name][1])
+        lists.extend(np.split(order, np.cumsum(counts)[:-1]))
+        if name == "time":
+            for r in range(len(rules.rule_names)):
+                lists.append(np.flatnonzero(fires[inverse, r]))
+    # 키 순서대로: 연/월/일/시 -> 규칙 -> 신강 구간
+    lengths = np.array([len(x) for x in lists], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    postings = np.concatenate(lists).astype(np.int32)
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+    np.save(os.path.join(path, "postings.npy"), postings)
+    meta = {
+        "format": FORMAT_VERSION, "start": start.isoformat(), "days": n_days,
+        "rules_version": rules.version, "power_thresholds": list(POWER_THRESHOLDS),
+        "rule_names": list(rules.rule_names), "layout": layout,
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+    return PillarIndex.load(path, rules)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m saju.pillar_index", description="기둥/규칙 역색인 생성 및 질의")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="역색인 생성")
+    p_build.add_argument("path")
+    p_build.add_argument("--start", type=int, default=1950, help="시작 연도 (기본 1950)")
+    p_build.add_argument("--end", type=int, default=2030, help="끝 연도, 포함 (기본 2030)")
+    p_query = sub.add_parser("query", help="조건에 맞는 생년월일시 구간 출력")
+    p_query.add_argument("path")
+    for pillar in PILLARS:
+        p_query.add_argument(f"--{pillar}", help=f"{pillar} 기둥 (예: 신사)")
+        p_query.add_argument(f"--{pillar}-stem")
+        p_query.add_argument(f"--{pillar}-branch")
+    p_query.add_argument("--rule", action="append", dest="rules", help="성립한 규칙 이름 (여러 번 가능)")
+    p_query.add_argument("--power", choices=POWER_DESCS)
+    p_query.add_argument("--from", dest="start", type=date.fromisoformat)
+    p_query.add_argument("--to", dest="end", type=date.fromisoformat)
+    args = vars(parser.parse_args(argv))
+
+    command, path = args.pop("command"), args.pop("path")
+    if command == "build":
+        index = build(path, args["start"], args["end"])
+        print(f"{index.days * SLOTS_PER_DAY:,}개 슬롯, 목록 {len(index.postings):,}개 -> {path}", file=sys.stderr)
+        return
+    index = PillarIndex.load(path)
+    for start, end in index.find(**args):
+        print(f"{start:%Y-%m-%d %H:%M}\t{end:%Y-%m-%d %H:%M}")
+
+
+if __name__ == "__main__":
+    main()
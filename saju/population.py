@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch import SajuBatchCalculator
+from .calculator import SajuCalculator
+from .rules import RULES
+from .tables import POWER_DESCS, POWER_THRESHOLDS, SIBSEONG_NAMES, SIBSEONG_OFFSETS
+
+# ---------------------------------------------------------
+# [분포] 전체 인구 대비 순위 ("상위 X%")
+# ---------------------------------------------------------
+# 기간 안의 모든 날짜 x 0~23시(정각)를 한 명씩으로 보고 신강 점수/신강 구간/오행별 점수/가장 강한 십성의
+# 히스토그램을 만든다. 결과는 수 KB 짜리 .npz 하나라서 요청 시에는 누적 비율 배열을 한 번 읽어 두고
+# 점수 -> 배열 위치 조회 한 번으로 순위를 돌려준다.
+#   생성: python -m saju.population population.npz --start 1900 --end 2100 --workers 8
+#   사용: PopulationStats.load(path).strength_top_percent(strength)
+# 연도 단위로 프로세스 풀에 나눠 계산하고, 해마다 서로 다른 원국만 한 번씩 점수를 매긴다.
+POPULATION_PATH = os.path.join(os.path.dirname(__file__), "population.npz")
+STRENGTH_RANGE = (-200, 200)  # 범위 밖 점수는 양 끝 칸에 넣는다
+ELEMENT_RANGE = (-50, 250)
+
+
+class PopulationStats:
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        self.strength_lo = int(arrays["strength_lo"])
+        self.element_lo = int(arrays["element_lo"])
+        self.strength_counts = arrays["strength_counts"]
+        self.element_counts = arrays["element_counts"]
+        self.power_counts = arrays["power_counts"]
+        self.top_sibseong_counts = arrays["top_sibseong_counts"]
+        self.total = int(self.strength_counts.sum())
+        # 위치 i = 그 점수 이상인 사람의 비율 (뒤에서부터 누적)
+        self._strength_at_least = (self.strength_counts[::-1].cumsum()[::-1] / self.total).tolist()
+        self._element_at_least = [(row[::-1].cumsum()[::-1] / self.total).tolist() for row in self.element_counts]
+
+    @classmethod
+    def load(cls, path=POPULATION_PATH, rules=RULES):
+        with np.load(path) as f:
+            arrays = {name: f[name] for name in f.files}
+        meta = json.loads(str(arrays.pop("meta")))
+        if meta["rules_version"] != rules.version:
+            raise ValueError(f"분포 규칙 버전({meta['rules_version']})이 현재 규칙({rules.version})과 다릅니다")
+        if meta.get("power_thresholds") != list(POWER_THRESHOLDS):
+            raise ValueError(f"분포의 신강 구간 경계({meta.get('power_thresholds')})가 현재({list(POWER_THRESHOLDS)})와 다릅니다")
+        return cls(arrays, meta)
+
+    @staticmethod
+    def _at(table, lo, score): return table[min(max(score - lo, 0), len(table) - 1)]
+
+    def strength_top_percent(self, strength):
+        """신강 점수가 이 점수 이상인 사람의 비율 (%) = 상위 X%"""
+        return 100 * self._at(self._strength_at_least, self.strength_lo, strength)
+
+    def element_top_percent(self, element_idx, score):
+        return 100 * self._at(self._element_at_least[element_idx], self.element_lo, score)
+
+    def power_share(self, power_desc):
+        """신강 구간(POWER_DESCS 이름 또는 번호) 에 드는 사람의 비율 (%)"""
+        bucket = POWER_DESCS.index(power_desc) if isinstance(power_desc, str) else power_desc
+        return 100 * int(self.power_counts[bucket]) / self.total
+
+    def top_sibseong_share(self, sibseong):
+        """가장 강한 십성(SIBSEONG_NAMES 이름 또는 번호) 이 같은 사람의 비율 (%)"""
+        idx = SIBSEONG_NAMES.index(sibseong) if isinstance(sibseong, str) else sibseong
+        return 100 * int(self.top_sibseong_counts[idx]) / self.total
+
+
+# ---------------------------------------------------------
+# 생성
+# ---------------------------------------------------------
+_calc = None
+
+
+def _sweep_year(year):
+    # 한 해 (1/1 ~ 12/31, 매시 정각) 의 히스토그램
+    global _calc
+    if _calc is None: _calc = SajuCalculator()
+    batch = SajuBatchCalculator()
+    days = np.arange(np.datetime64(f"{year}-01-01"), np.datetime64(f"{year + 1}-01-01"))
+    dates = np.repeat(days, 24)
+    hours = np.tile(np.arange(24), len(days))
+    pillars = np.stack(batch.get_four_pillars(dates, hours), axis=1).astype(np.int64)
+
+    combos, counts = np.unique(pillars, axis=0, return_counts=True)
+    scores = np.zeros((len(combos), 5), dtype=np.int64)
+    strength = np.zeros(len(combos), dtype=np.int64)
+    my_element = np.zeros(len(combos), dtype=np.int64)
+    for i, codes in enumerate(combos.tolist()):
+        result = _calc.score_codes(tuple(codes))
+        scores[i], strength[i], my_element[i] = result[0], result[1], result[2]
+    power = (strength[:, None] <= np.array(POWER_THRESHOLDS)).sum(axis=1)  # = SajuCalculator.get_power_bucket
+    sibseong = np.take_along_axis(scores, (my_element[:, None] + np.array(SIBSEONG_OFFSETS)) % 5, axis=1)
+
+    s_lo, s_hi = STRENGTH_RANGE
+    e_lo, e_hi = ELEMENT_RANGE
+    return {
+        "strength_counts": np.bincount(np.clip(strength, s_lo, s_hi) - s_lo, counts, s_hi - s_lo + 1),
+        "element_counts": np.stack([
+            np.bincount(np.clip(scores[:, e], e_lo, e_hi) - e_lo, counts, e_hi - e_lo + 1) for e in range(5)
+        ]),
+        "power_counts": np.bincount(power, counts, len(POWER_DESCS)),
+        "top_sibseong_counts": np.bincount(sibseong.argmax(axis=1), counts, len(SIBSEONG_NAMES)),
+    }
+
+
+def build(path=POPULATION_PATH, start_year=1900, end_year=2100, workers=None, progress=None):
+    years = range(start_year, end_year + 1)
+    workers = workers or os.cpu_count() or 1
+    totals = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for n, part in enumerate(pool.map(_sweep_year, years), 1):
+            totals = part if totals is None else {k: totals[k] + v for k, v in part.items()}
+            if progress: print(f"\r{n}/{len(years)}년", end="", file=progress, flush=True)
+    if progress: print(file=progress)
+
+    meta = {"start_year": start_year, "end_year": end_year, "hours": "0-23", "rules_version": RULES.version,
+            "power_thresholds": list(POWER_THRESHOLDS)}
+    arrays = {k: v.astype(np.int64) for k, v in totals.items()}
+    np.savez_compressed(
+        path, meta=np.array(json.dumps(meta)), strength_lo=np.array(STRENGTH_RANGE[0]),
+        element_lo=np.array(ELEMENT_RANGE[0]), **arrays,
+    )
+    return PopulationStats.load(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m saju.population", description="신강 점수/십성 분포 생성")
+    parser.add_argument("output", nargs="?", default=POPULATION_PATH)
+    parser.add_argument("--start", type=int, default=1900, help="시작 연도 (기본 1900)")
+    parser.add_argument("--end", type=int, default=2100, help="끝 연도, 포함 (기본 2100)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args(argv)
+    stats = build(args.output, args.start, args.end, args.workers, progress=sys.stderr)
+    print(f"{stats.total:,}명 -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
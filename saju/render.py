@@ -0,0 +1,113 @@
+# ---------------------------------------------------------
+# [렌더링] 원국표 / 십성 막대를 HTML 한 덩어리로
+# ---------------------------------------------------------
+# st.markdown 을 요소마다 부르면 웹소켓 delta 와 DOM 갱신이 요소 수만큼 생긴다.
+# 섹션 하나를 템플릿으로 미리 채워 한 번에 보내고, 결과 문자열은 기둥/점수 키로 캐시한다.
+from functools import lru_cache
+
+from .interpretation import sibseong_desc_db
+from .tables import BRANCH_TEN_GOD, ELEMENTS, GAN, GAN_ELEM, JI, JI_ELEM, SIBSEONG_NAMES, STEM_TEN_GOD, TEN_GOD_NAMES
+
+COLOR_MAP = {"목": "#4CAF50", "화": "#FF5252", "토": "#FFC107", "금": "#9E9E9E", "수": "#2196F3", "?": "#EEE"}
+TEXT_COLOR = {"토": "black"}
+GRID_TITLES = ("시주 (Time)", "일주 (Day)", "월주 (Month)", "연주 (Year)")
+
+GRID_TEMPLATE = "<div style='display:flex; gap:16px;'>{columns}</div>"
+GRID_COLUMN_TEMPLATE = (
+    "<div style='flex:1; min-width:0;'>"
+    "<div style='text-align:center; font-weight:bold; color:#555;'>{title}</div>"
+    "<div style='background-color:{s_bg}; color:{s_txt}; border-radius:10px; padding:10px; margin:5px; text-align:center;'>"
+    "<div style='font-size:12px;'>{s_god}</div>"
+    "<div style='font-size:30px; font-weight:bold;'>{stem}</div>"
+    "</div>"
+    "<div style='background-color:{b_bg}; color:{b_txt}; border-radius:10px; padding:10px; margin:5px; text-align:center;'>"
+    "<div style='font-size:30px; font-weight:bold;'>{branch}</div>"
+    "<div style='font-size:12px;'>{b_god}</div>"
+    "</div>"
+    "</div>"
+)
+
+SIBSEONG_BAR_TEMPLATE = (
+    "<div style=\"margin-bottom: 12px;\">"
+    "<div style=\"font-size:18px; font-weight:600; color:#333; margin-bottom: 4px;\">{name}</div>"
+    "<div style=\"width: 100%; background-color: #f0f2f6; border-radius: 8px; height: 16px;\">"
+    "<div style=\"width: {width_percent}%; background-color: #FF4B4B; height: 100%; border-radius: 8px;\"></div>"
+    "</div>"
+    "</div>"
+)
+SIBSEONG_DESC_TEMPLATE = (
+    "<div style='margin-top: 20px; padding: 15px; background-color: #e8f4f9; border-radius: 10px; border-left: 5px solid #42A5F5;'>"
+    "<p style='font-size:15px; line-height:1.6; color:#333; margin:0;'>{desc}</p></div>"
+)
+
+
+@lru_cache(maxsize=4096)
+def render_manse_grid(codes):
+    """원국표 (순서: 시 -> 일 -> 월 -> 연). codes 는 (연, 월, 일, 시) 60갑자 코드, 시간 모름은 -1"""
+    day_stem = codes[2] % 10
+    columns = []
+    for i, code in enumerate((codes[3], codes[2], codes[1], codes[0])):
+        if code >= 0:
+            stem, branch = code % 10, code % 12
+            s_elem, b_elem = ELEMENTS[GAN_ELEM[stem]], ELEMENTS[JI_ELEM[branch]]
+            s_god = "일원 (Me)" if i == 1 else TEN_GOD_NAMES[STEM_TEN_GOD[day_stem][stem]]
+            b_god = TEN_GOD_NAMES[BRANCH_TEN_GOD[day_stem][branch]]
+            stem, branch = GAN[stem], JI[branch]
+        else:
+            s_elem = b_elem = "?"
+            s_god = "일원 (Me)" if i == 1 else ""
+            b_god = ""
+            stem = branch = "??"
+        columns.append(GRID_COLUMN_TEMPLATE.format(
+            title=GRID_TITLES[i], stem=stem, branch=branch, s_god=s_god, b_god=b_god,
+            s_bg=COLOR_MAP[s_elem], s_txt=TEXT_COLOR.get(s_elem, "white"),
+            b_bg=COLOR_MAP[b_elem], b_txt=TEXT_COLOR.get(b_elem, "white"),
+        ))
+    return GRID_TEMPLATE.format(columns="".join(columns))
+
+
+def sibseong_ratios(sibseong_scores):
+    """십성 점수 (SIBSEONG_NAMES 순서) -> [(이름, 비율)] 비율 큰 순 (동점은 원래 순서)"""
+    safe_scores = [max(0, s) for s in sibseong_scores]
+    total_sib = sum(safe_scores) or 1
+    data_sib = [(name, score / total_sib) for name, score in zip(SIBSEONG_NAMES, safe_scores)]
+    data_sib.sort(key=lambda x: x[1], reverse=True)
+    return data_sib
+
+
+@lru_cache(maxsize=4096)
+def render_sibseong_section(sibseong_scores):
+    """십성 비율 막대 + 가장 강한 십성 설명. sibseong_scores 는 SIBSEONG_NAMES 순서의 점수 튜플"""
+    data_sib = sibseong_ratios(sibseong_scores)
+    bars = "".join(SIBSEONG_BAR_TEMPLATE.format(name=name, width_percent=ratio * 100) for name, ratio in data_sib)
+    max_sib_desc = sibseong_desc_db.get(data_sib[0][0], "설명 정보 없음")
+    return bars + SIBSEONG_DESC_TEMPLATE.format(desc=max_sib_desc)
+
+
+LUCK_DECADE_TEMPLATE = (
+    "<div style='margin-bottom:14px;'>"
+    "<div style='font-weight:bold; color:#333; margin-bottom:6px;'>{title}</div>"
+    "<div style='display:flex; gap:4px; flex-wrap:wrap;'>{cells}</div>"
+    "</div>"
+)
+LUCK_CELL_TEMPLATE = (
+    "<div style='width:64px; text-align:center; border-radius:8px; padding:4px 0; background-color:{bg}; color:{txt};'>"
+    "<div style='font-size:11px;'>{year} ({age}세)</div>"
+    "<div style='font-size:18px; font-weight:bold;'>{pillar}</div>"
+    "<div style='font-size:11px;'>{strength:+d}</div>"
+    "</div>"
+)
+
+
+def render_luck_decade(daeun, seun):
+    """대운 하나(대운 전이면 None)와 그 기간 세운 목록 -> HTML 한 덩어리. 칸 색은 세운 천간의 오행"""
+    if daeun is None: title = "대운 전 (원국)"
+    else: title = f"{daeun['age']}~{daeun['end_age']}세 · {daeun['pillar']} 대운 · {daeun['power_desc']} ({daeun['strength']}점)"
+    cells = []
+    for p in seun:
+        elem = ELEMENTS[GAN_ELEM[p["code"] % 10]]
+        cells.append(LUCK_CELL_TEMPLATE.format(
+            year=p["year"], age=p["age"], pillar=p["pillar"], strength=p["strength"],
+            bg=COLOR_MAP[elem], txt=TEXT_COLOR.get(elem, "white"),
+        ))
+    return LUCK_DECADE_TEMPLATE.format(title=title, cells="".join(cells))
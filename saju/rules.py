@@ -0,0 +1,172 @@
+# ---------------------------------------------------------
+# [규칙] 합/충/삼합/방합/병존 규칙표 -> 비트마스크 컴파일
+# ---------------------------------------------------------
+# 규칙은 rules.json 에 선언만 하고, 여기서 10비트(천간)/12비트(지지) 마스크로 컴파일한다.
+# 원국의 천간/지지 마스크가 정해지면 발생하는 규칙과 점수 변화도 정해지므로
+# 마스크별 결과를 한 번만 계산해 두고(처음 나올 때 채움) 이후에는 dict 조회 한 번으로 끝난다.
+# 규칙을 늘려도 점수 계산 경로의 비용은 그대로다.
+import hashlib
+import json
+from pathlib import Path
+
+from .tables import ELEMENTS, GAN, JI
+
+RULES_PATH = Path(__file__).with_name("rules.json")
+
+# 천간충은 일간과 연/월/시 천간 사이에서만 본다
+CHUNG_PILLARS = (0, 1, 3)
+
+
+def _stems(text): return tuple(GAN.index(c) for c in text)
+def _branches(text): return tuple(JI.index(c) for c in text)
+def _mask(indices): return sum(1 << i for i in indices)
+
+
+def load_rule_table(path=RULES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class CompiledRules:
+    """규칙표 하나를 컴파일한 결과. fired 비트 순서 = 계산 단계 순서 = 로그 순서"""
+
+    def __init__(self, table):
+        self.table = table
+        # 규칙표 내용이 바뀌면 버전도 바뀐다 (점수표/결과 저장소 무효화용)
+        canonical = json.dumps(table, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+        # 천간충: 일간 x 천간 감점표
+        penalty = [[0] * 10 for _ in range(10)]
+        for rule in table["chung"]:
+            a, b = _stems(rule["pair"])
+            penalty[a][b] = penalty[b][a] = rule["penalty"]
+        self.chung_penalty = tuple(tuple(row) for row in penalty)
+
+        # 천간합: (이름, 천간 쌍, 마스크, ((오행, 점수), ...))
+        self.hap = tuple(
+            (rule["name"], _stems(rule["pair"]), _mask(_stems(rule["pair"])),
+             tuple((ELEMENTS.index(e), sc) for e, sc in rule["changes"].items()))
+            for rule in table["hap"]
+        )
+        # 지지충: (이름, 지지 쌍, 마스크, 오행1, 오행2, 점수)
+        self.jiji_chung = tuple(
+            (rule["name"], _branches(rule["pair"]), _mask(_branches(rule["pair"])),
+             ELEMENTS.index(rule["elements"][0]), ELEMENTS.index(rule["elements"][1]), rule["score"])
+            for rule in table["jiji_chung"]
+        )
+        # 삼합 다음 방합: (이름, 구성 지지, 마스크, 대상 오행)
+        self.hap3 = tuple(
+            (rule["name"], _branches(rule["name"]), _mask(_branches(rule["name"])), ELEMENTS.index(rule["element"]))
+            for group in ("samhap", "banghap") for rule in table[group]
+        )
+        self.hap3_scores = {int(cnt): score for cnt, score in table["hap3_scores"].items()}
+        self.byeongjon_score = table["byeongjon"]["score"]
+
+        self.hap_bit = len(CHUNG_PILLARS)
+        self.jiji_chung_bit = self.hap_bit + len(self.hap)                 # 규칙마다 2비트 (오행1 승 / 오행2 승)
+        self.hap3_bit = self.jiji_chung_bit + 2 * len(self.jiji_chung)
+        self.byeongjon_bit = self.hap3_bit + len(self.hap3)                # 천간 3비트 + 지지 3비트
+        self.event_bits = self.byeongjon_bit + 6
+
+        # 규칙 이름 목록 (역색인/통계용 규칙 번호 = 이 목록의 위치)
+        self.rule_names = (
+            [rule["name"] for rule in table["chung"]] + [rule[0] for rule in self.hap]
+            + [rule[0] for rule in self.jiji_chung] + [rule[0] for rule in self.hap3] + ["천간병존", "지지병존"]
+        )
+        self.rule_kinds = (
+            ["천간충"] * len(table["chung"]) + ["천간합"] * len(self.hap) + ["지지충"] * len(self.jiji_chung)
+            + ["삼합·방합"] * len(self.hap3) + ["병존"] * 2
+        )
+        chung_ids = [[-1] * 10 for _ in range(10)]
+        for rule_id, rule in enumerate(table["chung"]):
+            a, b = _stems(rule["pair"])
+            chung_ids[a][b] = chung_ids[b][a] = rule_id
+        self._chung_ids = tuple(tuple(row) for row in chung_ids)
+
+        self._stem_events = {}
+        self._branch_events = {}
+
+    def stem_events(self, stem_mask):
+        """천간 마스크 -> (fired 비트, 오행별 점수 변화, 오행별 가산점(신강 계산용))"""
+        events = self._stem_events.get(stem_mask)
+        if events is None:
+            fired = 0
+            deltas = [0] * 5
+            gains = [0] * 5
+            for k, (_, _, mask, changes) in enumerate(self.hap):
+                if stem_mask & mask == mask:
+                    fired |= 1 << (self.hap_bit + k)
+                    for elem, score in changes:
+                        deltas[elem] += score
+                        if score > 0: gains[elem] += score
+            events = self._stem_events[stem_mask] = (fired, tuple(deltas), tuple(gains))
+        return events
+
+    def branch_events(self, branch_mask):
+        """지지 마스크 -> (성립한 지지충 [(규칙 번호, 오행1, 오행2, 점수)], 삼합/방합 fired 비트, 오행별 가산점)"""
+        events = self._branch_events.get(branch_mask)
+        if events is None:
+            chung = tuple(
+                (k, e1, e2, sc) for k, (_, _, mask, e1, e2, sc) in enumerate(self.jiji_chung)
+                if branch_mask & mask == mask
+            )
+            fired = 0
+            adds = [0] * 5
+            for k, (_, _, mask, target) in enumerate(self.hap3):
+                add = self.hap3_scores.get((branch_mask & mask).bit_count(), 0)
+                if add > 0:
+                    fired |= 1 << (self.hap3_bit + k)
+                    adds[target] += add
+            events = self._branch_events[branch_mask] = (chung, fired, tuple(adds))
+        return events
+
+    def fired_rule_ids(self, codes, fired):
+        """fired 비트 -> 성립한 규칙 번호(rule_names 위치) 집합"""
+        ids = set()
+        day_stem = codes[2] % 10
+        for bit, i in enumerate(CHUNG_PILLARS):
+            if fired >> bit & 1: ids.add(self._chung_ids[day_stem][codes[i] % 10])
+        base = len(self.table["chung"])
+        for k in range(len(self.hap)):
+            if fired >> (self.hap_bit + k) & 1: ids.add(base + k)
+        base += len(self.hap)
+        for k in range(len(self.jiji_chung)):
+            if fired >> (self.jiji_chung_bit + 2 * k) & 3: ids.add(base + k)
+        base += len(self.jiji_chung)
+        for k in range(len(self.hap3)):
+            if fired >> (self.hap3_bit + k) & 1: ids.add(base + k)
+        base += len(self.hap3)
+        if fired >> self.byeongjon_bit & 7: ids.add(base)
+        if fired >> (self.byeongjon_bit + 3) & 7: ids.add(base + 1)
+        return ids
+
+    def render_logs(self, codes, fired):
+        """fired 비트 -> 로그 문장 (세력전쟁 제외)"""
+        day_stem = codes[2] % 10
+        logs = []
+        for bit, i in enumerate(CHUNG_PILLARS):
+            if fired >> bit & 1:
+                stem = codes[i] % 10
+                logs.append(f"💥 천간충 ({GAN[day_stem]} 💥 {GAN[stem]})! 내 기운 -{self.chung_penalty[day_stem][stem]}")
+        for k, (_, pair, _, _) in enumerate(self.hap):
+            if fired >> (self.hap_bit + k) & 1:
+                logs.append(f"💖 천간합 ({' ❤️ '.join(GAN[s] for s in pair)}) 성립!")
+        for k, (_, pair, _, e1, e2, sc) in enumerate(self.jiji_chung):
+            for won, w in enumerate((e1, e2)):
+                if fired >> (self.jiji_chung_bit + 2 * k + won) & 1:
+                    logs.append(f"⚔️ 지지충 ({JI[pair[0]]} 💥 {JI[pair[1]]})! 승자:{ELEMENTS[w]}(+{sc})")
+        branches = {code % 12 for code in codes if code >= 0}
+        for k, (name, members, _, _) in enumerate(self.hap3):
+            if fired >> (self.hap3_bit + k) & 1:
+                matched = [JI[b] for b in members if b in branches]
+                logs.append(f"🌀 {name} ({','.join(matched)}) +{self.hap3_scores[len(matched)]}")
+        for offset, names, modulo in [(0, GAN, 10), (3, JI, 12)]:
+            for k in range(3):
+                if fired >> (self.byeongjon_bit + offset + k) & 1:
+                    char = names[codes[k] % modulo]
+                    logs.append(f"👯 병존 ({char} 🤝 {char}) +{self.byeongjon_score}")
+        return logs
+
+
+RULES = CompiledRules(load_rule_table())
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+
+from .calculator import SajuCalculator, score_pillar_codes
+from .rules import RULES
+from .tables import GAN_ELEM
+
+
+# ---------------------------------------------------------
+# [점수표] 오프라인 생성 + 메모리 매핑 점수표
+# ---------------------------------------------------------
+# 도달 가능한 모든 원국(연 60 x 월 12 x 일 60 x 시 12+모름 1 = 561,600개)의 점수를 .npy 한 파일에 저장.
+# np.load(mmap_mode="r") 로 열기 때문에 여러 워커 프로세스가 같은 페이지를 읽기 전용으로 공유한다.
+# 생성: python -m saju.score_table score_table.npy  /  사용: SajuCalculator(score_table=ScoreTable.load(path))
+# 만들 때의 규칙표 버전은 옆의 <path>.json 에 기록하고, 계산기는 버전이 다르면 거부한다.
+class ScoreTable:
+    dtype = np.dtype([("scores", "<i2", 5), ("strength", "<i2"), ("fired", "<u4"), ("battle", "u1")])
+    size = 60 * 12 * 60 * 13
+
+    def __init__(self, records, rules_version):
+        self.records = records
+        self.rules_version = rules_version
+
+    @classmethod
+    def load(cls, path):
+        records = np.load(path, mmap_mode="r")
+        if records.dtype != cls.dtype or records.shape != (cls.size,):
+            raise ValueError(f"점수표 형식이 맞지 않습니다: {path}")
+        with open(f"{path}.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(records, meta["rules_version"])
+
+    @staticmethod
+    def index(codes):
+        # 월주 천간은 연간, 시주 천간은 일간으로 정해지므로 지지만으로 위치가 결정된다.
+        # 그 규칙을 벗어나는(도달 불가능한) 조합은 None
+        year_code, month_code, day_code, time_code = codes
+        month_idx = (month_code % 12 - 2) % 12
+        if month_code % 10 != ((year_code % 10 % 5) * 2 + 2 + month_idx) % 10: return None
+        if time_code < 0:
+            time_idx = 12
+        else:
+            time_idx = time_code % 12
+            if time_code % 10 != ((day_code % 10 % 5) * 2 + time_idx) % 10: return None
+        return ((year_code * 12 + month_idx) * 60 + day_code) * 13 + time_idx
+
+    def lookup(self, codes):
+        idx = self.index(codes)
+        if idx is None: return None
+        scores, strength, fired, battle = self.records[idx].item()
+        return tuple(scores.tolist()), strength, GAN_ELEM[codes[2] % 10], fired, battle
+
+    @classmethod
+    def build(cls, path, rules=RULES):
+        if rules.event_bits > 32: raise ValueError(f"규칙이 너무 많아 fired 가 32비트를 넘습니다: {rules.event_bits}")
+        calc = SajuCalculator(cache_size=0, rules=rules)   # 기둥 코드 공식만 빌려 쓴다
+        records = np.lib.format.open_memmap(path, mode="w+", dtype=cls.dtype, shape=(cls.size,))
+        for year_code in range(60):
+            for month_idx in range(12):
+                month_code = calc.get_month_code_by_idx(year_code, month_idx)
+                for day_code in range(60):
+                    # 시 번호 t 는 2t 시에 해당 (자시=0시), 마지막 하나는 시간 모름
+                    for time_code in [calc.get_time_code(day_code, 2 * t) for t in range(12)] + [-1]:
+                        codes = (year_code, month_code, day_code, time_code)
+                        scores, strength, _, fired, battle = score_pillar_codes(codes, rules)
+                        records[cls.index(codes)] = (scores, strength, fired, battle)
+        records.flush()
+        with open(f"{path}.json", "w", encoding="utf-8") as f:
+            json.dump({"rules_version": rules.version}, f)
+        return cls.load(path)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) != 2: sys.exit("사용법: python -m saju.score_table <출력.npy>")
+    started = time.perf_counter()
+    ScoreTable.build(sys.argv[1])
+    print(f"{sys.argv[1]}: {ScoreTable.size:,}개 원국, {time.perf_counter() - started:.1f}초")
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from urllib.parse import parse_qsl, urlsplit
+
+from .cli import parse_birth_time
+from .interpretation import default_desc, ilju_data
+from .worker import get_calculator
+
+# ---------------------------------------------------------
+# [API 서버] asyncio HTTP/JSON 서버 (표준 라이브러리만 사용)
+# ---------------------------------------------------------
+#   python -m saju.server --port 8000 --workers 4
+#   POST /analyze  {"birth_date": "1990-05-17", "birth_time": "13:30", "logs": true}   (birth_time 생략/모름 = 시간 모름)
+#   POST /analyze  [{...}, {...}]   여러 명을 한 번에 -> 결과 배열
+#   GET  /analyze?birth_date=1990-05-17&birth_time=13:30
+#   GET  /health
+#
+# 짧은 창(batch_window) 안에 들어온 요청은 모아서(같은 입력은 하나로) 프로세스 풀에 한 번에 보낸다.
+# 워커가 JSON 바이트까지 만들어 돌려주고, 그 바이트를 입력 키로 LRU 캐시해 다음 요청은 바로 응답한다.
+# 한 키의 실패는 그 키를 기다리는 요청에만 전달되고, 워커가 죽어 풀이 깨지면 새 풀을 만들어 한 번 다시 보낸다.
+MAX_BODY = 1 << 20
+
+
+def normalize_request(item):
+    # 요청 JSON 하나 -> 캐시/배치 키 (생년월일, 시 또는 None, 분, 로그 여부)
+    if not isinstance(item, dict): raise ValueError("요청은 JSON 객체여야 합니다")
+    birth_date = date.fromisoformat(str(item["birth_date"]).strip())
+    hour, minute = parse_birth_time(item.get("birth_time"))
+    return birth_date.isoformat(), hour, minute, bool(item.get("logs", False))
+
+
+def analyze_key(key):
+    birth_date, hour, minute, with_logs = key
+    result = get_calculator().analyze(date.fromisoformat(birth_date), hour, minute, with_logs=with_logs)
+    day_pillar = result["pillars"][2]
+    body = {
+        "birth_date": birth_date,
+        "birth_time": None if hour is None else f"{hour:02d}:{minute:02d}",
+        "pillars": result["pillars"],
+        "my_element": result["my_element"],
+        "element_scores": result["element_scores"],
+        "strength": result["strength"],
+        "power_desc": result["power_desc"],
+        "sibseong_scores": result["sibseong_scores"],
+        "ilju_desc": ilju_data.get(day_pillar, default_desc),
+    }
+    if with_logs: body["logs"] = result["logs"]
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _analyze_batch(keys):
+    # 키마다 JSON 바이트 또는 그 키에서 난 예외 (한 키가 실패해도 나머지는 계산한다)
+    out = []
+    for key in keys:
+        try:
+            out.append(analyze_key(key))
+        except Exception as e:
+            # 부모 프로세스로 pickle 해 보내므로 내장 예외만 그대로 (400/500 구분은 예외 종류로 한다)
+            out.append(e if type(e).__module__ == "builtins" else RuntimeError(f"{type(e).__name__}: {e}"))
+    return out
+
+
+def _warm_up():
+    get_calculator()
+    return os.getpid()
+
+
+class MicroBatcher:
+    """window 초 안에 들어온 키를 모아 executor 에서 한 번에 계산. 응답은 LRU 캐시.
+    make_executor 를 주면 프로세스 풀이 깨졌을 때(BrokenProcessPool) 그것으로 새 풀을 만든다"""
+
+    def __init__(self, executor, window=0.002, max_batch=256, cache_size=100_000, make_executor=None):
+        self.executor = executor
+        self.make_executor = make_executor
+        self.window = window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self._waiting = {}      # 키 -> 결과를 기다리는 future (같은 키는 하나만)
+        self._timer = None
+        self.stats = {"requests": 0, "cache_hits": 0, "batches": 0, "computed": 0, "errors": 0, "pool_restarts": 0}
+
+    async def get(self, key):
+        self.stats["requests"] += 1
+        body = self.cache.get(key)
+        if body is not None:
+            self.cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return body
+        future = self._waiting.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._waiting[key] = loop.create_future()
+            if len(self._waiting) >= self.max_batch: self._flush()
+            elif self._timer is None: self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._waiting = self._waiting, {}
+        if batch: asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        keys = list(batch)
+        self.stats["batches"] += 1
+        self.stats["computed"] += len(keys)
+        try:
+            bodies = await self._submit(keys)
+        except Exception as e:
+            bodies = [e] * len(keys)
+        for key, body in zip(keys, bodies):
+            future = batch[key]
+            if future.done(): continue
+            if isinstance(body, Exception):
+                self.stats["errors"] += 1
+                future.set_exception(body)
+            else:
+                self.cache[key] = body
+                future.set_result(body)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def _submit(self, keys):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, _analyze_batch, keys)
+            except BrokenProcessPool:
+                if self.make_executor is None: raise
+                # 같은 풀이 깨진 것을 여러 배치가 동시에 보더라도 새 풀은 한 번만 만든다
+                if self.executor is executor:
+                    self.executor = self.make_executor()
+                    self.stats["pool_restarts"] += 1
+                    executor.shutdown(wait=False)
+                if attempt: raise
+
+
+# ---------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+def _response(status, body, keep_alive=True):
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _error(message): return json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+
+
+class SajuServer:
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def handle(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, json.dumps({"status": "ok", **self.batcher.stats}).encode("utf-8")
+        if url.path != "/analyze": return 404, _error("없는 경로입니다")
+        if method == "GET":
+            payload = dict(parse_qsl(url.query))
+            payload["logs"] = payload.get("logs", "").lower() in ("1", "true", "yes")
+        elif method == "POST":
+            payload = json.loads(body or b"null")
+        else:
+            return 405, _error("GET 또는 POST 만 지원합니다")
+
+        if isinstance(payload, list):
+            keys = [normalize_request(item) for item in payload]
+            bodies = await asyncio.gather(*(self.batcher.get(key) for key in keys))
+            return 200, b"[" + b",".join(bodies) + b"]"
+        return 200, await self.batcher.get(normalize_request(payload))
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""): break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if length > MAX_BODY:
+                    writer.write(_response(413, _error("요청이 너무 큽니다"), False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await self.handle(method, target, body)
+                except (KeyError, ValueError, TypeError, AttributeError) as e:  # 잘못된 입력 (JSONDecodeError 도 ValueError)
+                    status, payload = 400, _error(f"{type(e).__name__}: {e}")
+                except Exception as e:
+                    status, payload = 500, _error(f"{type(e).__name__}: {e}")
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=8000, workers=None, window=0.002, max_batch=256, cache_size=100_000):
+    workers = workers or os.cpu_count() or 1
+    def make_executor(): return ProcessPoolExecutor(max_workers=workers)
+
+    batcher = MicroBatcher(make_executor(), window, max_batch, cache_size, make_executor)
+    try:
+        # 워커를 미리 띄워 첫 요청이 프로세스 시작을 기다리지 않게 한다
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(batcher.executor, _warm_up)
+                               for _ in range(workers)))
+        server = SajuServer(batcher)
+        listener = await asyncio.start_server(server.serve_connection, host, port, backlog=1024)
+        print(f"http://{host}:{port} (워커 {workers}개, 배치 창 {window * 1000:g}ms)", file=sys.stderr)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        batcher.executor.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m saju.server", description="사주 분석 HTTP/JSON 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="계산 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0, help="요청을 모으는 시간 (기본 2ms)")
+    parser.add_argument("--max-batch", type=int, default=256, help="창이 끝나기 전이라도 이만큼 모이면 바로 계산")
+    parser.add_argument("--cache-size", type=int, default=100_000, help="응답 캐시 항목 수")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window_ms / 1000, args.max_batch,
+                          args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
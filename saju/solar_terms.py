@@ -0,0 +1,95 @@
+# ---------------------------------------------------------
+# [절기] 월/연 경계용 12절기 시각표
+# ---------------------------------------------------------
+# 1900~2100년의 12절(소한, 입춘, 경칩, 청명, 입하, 망종, 소서, 입추, 백로, 한로, 입동, 대설) 시각을
+# jeolgi.bin 에 미리 계산해 두었다. 요청 시에는 천문 계산 없이 mmap + 이분 탐색만 한다.
+#
+# 파일 형식: little-endian int32 배열, 1900-01-01 00:00 한국 표준시(UTC+9)부터의 분.
+#           i 번째 값 = (FIRST_YEAR + i // 12)년의 (i % 12)번째 절기 (0=소한, 1=입춘, ..., 11=대설)
+# 다시 만들기: pip install astropy && python -m saju.solar_terms jeolgi.bin
+#           (astropy 내장 천체력 사용, 다운로드 없음. 천문연구원 발표 시각과 분 단위로 일치)
+import bisect
+import mmap
+import sys
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+TERMS_PATH = Path(__file__).with_name("jeolgi.bin")
+FIRST_YEAR, LAST_YEAR = 1900, 2100
+TERM_NAMES = ("소한", "입춘", "경칩", "청명", "입하", "망종", "소서", "입추", "백로", "한로", "입동", "대설")
+TERM_LONGITUDES = tuple((285 + 30 * k) % 360 for k in range(12))  # 태양 황경
+EPOCH = datetime(1900, 1, 1)
+
+
+def to_minutes(moment):
+    """한국 시각 -> EPOCH 부터의 분. 날짜만 주면 정오로 본다"""
+    if not isinstance(moment, datetime): moment = datetime.combine(moment, time(12))
+    delta = moment - EPOCH
+    return delta.days * 1440 + delta.seconds // 60
+
+
+class SolarTermTable:
+    def __init__(self, path=TERMS_PATH):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) != (LAST_YEAR - FIRST_YEAR + 1) * 12 * 4:
+            raise ValueError(f"절기표 크기가 맞지 않습니다: {path}")
+        if sys.byteorder == "little":
+            self.minutes = memoryview(self._mmap).cast("i")
+        else:
+            from array import array
+            self.minutes = array("i", self._mmap)
+            self.minutes.byteswap()
+
+    def term_index(self, moment):
+        """moment 직전(같은 분 포함)의 절기 번호. 표 범위 밖이면 None"""
+        idx = bisect.bisect_right(self.minutes, to_minutes(moment)) - 1
+        if idx < 0 or idx >= len(self.minutes) - 1: return None
+        return idx
+
+    def saju_year_month(self, moment):
+        """절기 기준 (사주 연도, 월 번호 0=인월 ~ 11=축월). 표 범위 밖이면 None"""
+        idx = self.term_index(moment)
+        if idx is None: return None
+        year, k = FIRST_YEAR + idx // 12, idx % 12
+        return (year if k >= 1 else year - 1), (k - 1) % 12
+
+    def term_moment(self, idx):
+        return EPOCH + timedelta(minutes=self.minutes[idx])
+
+
+_table = None
+
+
+def get_solar_terms():
+    # 처음 쓸 때 한 번만 연다 (import 비용 없음)
+    global _table
+    if _table is None: _table = SolarTermTable()
+    return _table
+
+
+def build(path, first_year=FIRST_YEAR, last_year=LAST_YEAR):
+    import astropy.units as u
+    import numpy as np
+    from astropy.coordinates import GeocentricTrueEcliptic, get_sun
+    from astropy.time import Time
+
+    years = np.repeat(np.arange(first_year, last_year + 1), 12)
+    k = np.tile(np.arange(12), last_year - first_year + 1)
+    target = np.array(TERM_LONGITUDES, dtype=float)[k]
+    # 초기값: 소한이 1월 6일쯤, 이후 절기마다 약 30.44일
+    guess = [f"{y}-01-06" for y in years]
+    t = Time(guess, scale="utc") + (k * 30.436875) * u.day
+    for _ in range(6):
+        lon = get_sun(t).transform_to(GeocentricTrueEcliptic(equinox=t)).lon.deg
+        t = t + ((target - lon + 180) % 360 - 180) / 360 * 365.2422 * u.day
+    kst = (t + 9 * u.hour).to_datetime()
+    minutes = np.array([round((m - EPOCH).total_seconds() / 60) for m in kst], dtype="<i4")
+    if np.any(np.diff(minutes) <= 0): raise RuntimeError("절기 시각이 증가 순서가 아닙니다")
+    minutes.tofile(path)
+    return minutes
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2: sys.exit("사용법: python -m saju.solar_terms <출력.bin>")
+    build(sys.argv[1])
@@ -0,0 +1,239 @@
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .rules import RULES
+from .tables import POWER_THRESHOLDS
+
+# ---------------------------------------------------------
+# [저장소] 여러 프로세스가 같이 쓰는 분석 결과 SQLite 저장소
+# ---------------------------------------------------------
+# 키: (생년월일, 시(모름은 -1), 분, 규칙표 버전). 값: SajuCalculator.analyze 결과 JSON.
+#   - WAL 모드라 읽기는 쓰기를 기다리지 않고, 여러 Streamlit 프로세스가 같은 파일을 열어도 된다.
+#   - 연결은 큐 하나로 돌려 쓴다 (스레드 안전). 쓰기와 마지막 조회 시각 갱신은 모아 두었다가
+#     batch_size 개가 차거나 flush_interval 초마다 트랜잭션 하나로 쓴다.
+#   - 행 수가 max_rows 를 넘으면 마지막 조회 시각이 오래된 것부터 지운다 (LRU).
+#   - 규칙표/신강 구간 경계/결과 형식이 바뀌면 버전이 달라져 옛 행은 더 이상 조회되지 않는다 (무효화 비용 0).
+#     옛 행은 조회 시각이 멈춰 있으므로 LRU 로 먼저 빠지고, purge_stale() 로 한 번에 지울 수도 있다.
+#   - 저장소는 캐시일 뿐이라 SQLite 오류(잠김 등)는 기록만 하고 읽기/계산 경로로 올리지 않는다.
+#     쓰지 못한 행은 버퍼에 되돌려 다음 flush 때 다시 쓴다 (버퍼가 max_buffer 를 넘으면 오래된 것부터 버림).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    birth_date TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    minute INTEGER NOT NULL,
+    rules_version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    last_access INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS results_key ON results (birth_date, hour, minute, rules_version);
+CREATE INDEX IF NOT EXISTS results_lru ON results (last_access);
+"""
+
+
+RESULT_FORMAT = 1   # analyze() 결과 dict 의 모양이 바뀌면 올린다
+log = logging.getLogger(__name__)
+
+
+def result_version(rules=RULES):
+    # 저장된 결과를 바꾸는 모든 것: 규칙표 해시 + 신강 구간 경계(power_desc) + 결과 형식
+    return f"{rules.version}/p{','.join(map(str, POWER_THRESHOLDS))}/f{RESULT_FORMAT}"
+
+
+RESULT_VERSION = result_version()
+
+
+def normalize_key(birth_date, hour=None, minute=0, rules_version=RESULT_VERSION):
+    # 시간 모름은 (-1, 0)
+    if hour is None or hour < 0: return birth_date.isoformat(), -1, 0, rules_version
+    return birth_date.isoformat(), int(hour), int(minute or 0), rules_version
+
+
+def _now_ms(): return int(time.time() * 1000)
+
+
+class ResultStore:
+    def __init__(self, path, max_rows=1_000_000, pool_size=4, batch_size=256, flush_interval=1.0,
+                 rules_version=RESULT_VERSION, max_buffer=None, timeout=30.0):
+        self.path = path
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rules_version = rules_version
+        self.max_buffer = max_buffer or batch_size * 64
+        self.timeout = timeout
+
+        self._pool_size = pool_size
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._approx_rows = conn.execute("SELECT count(*) FROM results").fetchone()[0]
+
+        self._lock = threading.Lock()
+        self._pending = {}     # 키 -> (payload, 접근 시각)  아직 안 쓴 결과
+        self._touched = {}     # 키 -> 접근 시각            조회 시각 갱신만 필요한 키
+        self._flusher = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    # -----------------------------------------------------
+    # 읽기 / 쓰기
+    # -----------------------------------------------------
+    def get(self, birth_date, hour=None, minute=0):
+        """저장된 analyze 결과 dict, 없으면 None"""
+        key = normalize_key(birth_date, hour, minute, self.rules_version)
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None: return self._decode(pending[0])
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT payload FROM results WHERE birth_date=? AND hour=? AND minute=? AND rules_version=?", key,
+                ).fetchone()
+        except sqlite3.Error as e:
+            log.warning("결과 저장소 조회 실패 (없는 것으로 봄): %s", e)
+            return None
+        if row is None: return None
+        self._enqueue(self._touched, key, _now_ms())
+        return self._decode(row[0])
+
+    def put(self, birth_date, hour, minute, result):
+        key = normalize_key(birth_date, hour, minute, self.rules_version)
+        payload = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        self._enqueue(self._pending, key, (payload, _now_ms()))
+
+    def get_or_compute(self, birth_date, hour, minute, compute):
+        result = self.get(birth_date, hour, minute)
+        if result is None:
+            result = compute(birth_date, hour, minute)
+            self.put(birth_date, hour, minute, result)
+        return result
+
+    @staticmethod
+    def _decode(payload):
+        result = json.loads(payload)
+        if "codes" in result: result["codes"] = tuple(result["codes"])
+        return result
+
+    def _enqueue(self, target, key, value):
+        with self._lock:
+            target[key] = value
+            full = len(self._pending) + len(self._touched) >= self.batch_size
+            if (self._flusher is None or not self._flusher.is_alive()) and not self._closed:
+                self._flusher = threading.Thread(target=self._flush_loop, name="saju-result-store", daemon=True)
+                self._flusher.start()
+        if full: self._try_flush()
+
+    def _flush_loop(self):
+        while not self._closed:
+            time.sleep(self.flush_interval)
+            self._try_flush()
+
+    def _try_flush(self):
+        # 백그라운드/요청 경로용: 실패해도 예외를 올리지 않는다 (행은 flush 가 버퍼에 되돌려 둠)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            log.warning("결과 저장소 쓰기 실패, 다음에 다시 시도: %s", e)
+
+    def _restore(self, pending, touched):
+        # 쓰지 못한 행을 버퍼에 되돌린다. 그 사이 새로 들어온 값이 우선
+        with self._lock:
+            self._pending = {**pending, **self._pending}
+            for key, at in touched.items():
+                if self._touched.get(key, 0) < at: self._touched[key] = at
+            if len(self._pending) + len(self._touched) > self.max_buffer:
+                self._touched.clear()   # 조회 시각은 잃어도 LRU 순서만 조금 틀어진다
+                drop = list(self._pending)[:max(0, len(self._pending) - self.max_buffer)]
+                for key in drop: del self._pending[key]
+                if drop: log.warning("결과 저장소 버퍼가 가득 차 오래된 결과 %d건을 버림", len(drop))
+
+    def flush(self):
+        """모아 둔 쓰기를 트랜잭션 하나로 쓴다. 실패하면 행을 버퍼에 되돌리고 sqlite3.Error 를 그대로 올린다"""
+        if self._closed: return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+        if not pending and not touched: return
+        try:
+            self._write(pending, touched)
+        except BaseException:
+            self._restore(pending, touched)
+            raise
+
+    def _write(self, pending, touched):
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO results (birth_date, hour, minute, rules_version, payload, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*key, payload, at) for key, (payload, at) in pending.items()],
+                )
+                self._approx_rows += conn.total_changes - before
+                conn.executemany(
+                    "UPDATE results SET last_access=? WHERE birth_date=? AND hour=? AND minute=? AND rules_version=?",
+                    [(at, *key) for key, at in touched.items()],
+                )
+                if self._approx_rows > self.max_rows: self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn):
+        # 다른 프로세스도 쓰므로 실제 행 수를 다시 세고, 넘친 만큼 + 10% 여유를 오래된 것부터 지운다
+        rows = conn.execute("SELECT count(*) FROM results").fetchone()[0]
+        excess = rows - self.max_rows
+        if excess > 0:
+            excess += self.max_rows // 10
+            conn.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY last_access LIMIT ?)", (excess,),
+            )
+            rows -= excess
+        self._approx_rows = max(rows, 0)
+
+    # -----------------------------------------------------
+    # 관리
+    # -----------------------------------------------------
+    def purge_stale(self):
+        """현재 규칙표 버전이 아닌 행을 지우고 지운 행 수를 돌려준다"""
+        with self._connection() as conn:
+            deleted = conn.execute("DELETE FROM results WHERE rules_version != ?", (self.rules_version,)).rowcount
+        self._approx_rows = max(self._approx_rows - deleted, 0)
+        return deleted
+
+    def __len__(self):
+        self.flush()
+        with self._connection() as conn:
+            return conn.execute("SELECT count(*) FROM results WHERE rules_version=?", (self.rules_version,)).fetchone()[0]
+
+    def close(self):
+        if self._closed: return
+        self._try_flush()
+        self._closed = True
+        # 빌려 간 연결이 돌아올 때까지 기다렸다가 모두 닫는다
+        for _ in range(self._pool_size):
+            self._pool.get().close()
@@ -0,0 +1,49 @@
+# ---------------------------------------------------------
+# [핵심] 정수 코드 테이블
+# ---------------------------------------------------------
+# 천간 0~9, 지지 0~11, 오행 0~4(목화토금수), 60갑자 0~59(0=갑자, 천간=n%10, 지지=n%12).
+# 모르는 기둥(시간 모름)은 -1. 문자열은 화면에 보여줄 때만 만든다.
+GAN = "갑을병정무기경신임계"
+JI = "자축인묘진사오미신유술해"
+ELEMENTS = "목화토금수"
+GANJI = tuple(GAN[n % 10] + JI[n % 12] for n in range(60))
+GANJI_INDEX = {name: n for n, name in enumerate(GANJI)}
+
+# 오행 및 음양 정보 (0: 양, 1: 음)
+GAN_ELEM = (0, 0, 1, 1, 2, 2, 3, 3, 4, 4)
+GAN_POL = (0, 1, 0, 1, 0, 1, 0, 1, 0, 1)
+# ⚡ 지지 십성용 음양(체용): 자(음), 축(음), 인(양), 묘(음), 진(양), 사(양), 오(음), 미(음), 신(양), 유(음), 술(양), 해(양)
+# 자/사/오/해는 체와 용이 반대 (자=계수, 사=병화, 오=정화, 해=임수)
+JI_ELEM = (4, 2, 0, 0, 2, 1, 1, 2, 3, 3, 2, 4)
+JI_POL = (1, 1, 0, 1, 0, 0, 1, 1, 0, 1, 0, 0)
+
+SAENG = (1, 2, 3, 4, 0)  # 목->화->토->금->수->목
+GEUK = (2, 3, 4, 0, 1)   # 목->토->수->화->금->목
+# 나(일간 오행)를 돕는 기운(같은 오행, 나를 생하는 오행)이면 +1, 아니면 -1
+SUPPORT = tuple(tuple(1 if e == my or SAENG[e] == my else -1 for e in range(5)) for my in range(5))
+
+# 십성: (대상 오행 - 일간 오행) % 5 가 관계(비겁/식상/재성/관성/인성), 음양이 같으면 앞쪽 이름
+TEN_GOD_NAMES = ("비견", "겁재", "식신", "상관", "편재", "정재", "편관", "정관", "편인", "정인")
+STEM_TEN_GOD = tuple(
+    tuple((GAN_ELEM[t] - GAN_ELEM[d]) % 5 * 2 + (GAN_POL[d] != GAN_POL[t]) for t in range(10)) for d in range(10)
+)
+BRANCH_TEN_GOD = tuple(
+    tuple((JI_ELEM[t] - GAN_ELEM[d]) % 5 * 2 + (GAN_POL[d] != JI_POL[t]) for t in range(12)) for d in range(10)
+)
+
+# 십성 세력: 일간 오행 기준 오프셋 (비겁=나, 식상=내가 생, 재성=내가 극, 인성=나를 생, 관성=나를 극)
+SIBSEONG_NAMES = ("비겁 (나/동료)", "식상 (표현/재능)", "재성 (재물/결과)", "인성 (지혜/도움)", "관성 (명예/직장)")
+SIBSEONG_OFFSETS = (0, 1, 2, 4, 3)
+
+BASE_WEIGHTS = ((10, 7), (17, 15), (20, 20), (10, 5))
+# 운의 (천간, 지지) 가중치: 대운은 10년을 지배하므로 연주와 같은 천간에 지지를 더 무겁게, 세운은 그 절반
+LUCK_WEIGHTS = {"대운": (10, 10), "세운": (5, 5)}
+
+# 신강/신약 구간 (최종 에너지 점수 기준, 강한 순)
+POWER_DESCS = ("극신강", "신강", "신약", "극신약")
+# 구간 경계: 점수가 POWER_THRESHOLDS[i] 보다 크면 구간 i (어느 것보다도 크지 않으면 마지막 구간)
+POWER_THRESHOLDS = (20, 0, -20)
+
+
+# 세력전쟁 결과: 0=없음, 그 외 kind * 25 + top1 * 5 + top2
+BATTLE_SUPPRESS, BATTLE_REVOLT, BATTLE_DRAIN = 1, 2, 3
@@ -0,0 +1,21 @@
+import os
+
+# ---------------------------------------------------------
+# [워커] 프로세스마다 계산기 하나
+# ---------------------------------------------------------
+# 대량 처리(cli)와 API 서버(server)의 프로세스 풀 워커가 함께 쓴다. 점수 LRU 캐시도 프로세스별로 유지된다.
+# SAJU_SCORE_TABLE=<점수표.npy> 를 주면 미리 만든 점수표(mmap)를 붙인다.
+_calc = None
+
+
+def get_calculator():
+    global _calc
+    if _calc is None:
+        from .calculator import SajuCalculator
+        table_path = os.environ.get("SAJU_SCORE_TABLE")
+        if table_path:
+            from .score_table import ScoreTable
+            _calc = SajuCalculator(score_table=ScoreTable.load(table_path))
+        else:
+            _calc = SajuCalculator()
+    return _calc
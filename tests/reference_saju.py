@@ -0,0 +1,246 @@
+# 원래 app.py 의 계산기 (저장소 첫 커밋) 를 고치지 않고 그대로 옮겨 둔 것.
+# tests/test_scoring.py 가 saju 패키지의 결과가 이 구현과 같은지 비교한다. 이 파일은 수정하지 않는다.
+from datetime import datetime
+
+
+# ---------------------------------------------------------
+# [핵심] 사주팔자 계산기
+# ---------------------------------------------------------
+class SajuCalculator:
+    def __init__(self):
+        self.gan = list("갑을병정무기경신임계")
+        self.ji = list("자축인묘진사오미신유술해")
+        self.month_ji = list("인묘진사오미신유술해자축")
+        
+        # 오행 및 음양 정보 (0: 양, 1: 음)
+        self.gan_info = {
+            "갑": ("목", 0), "을": ("목", 1), "병": ("화", 0), "정": ("화", 1),
+            "무": ("토", 0), "기": ("토", 1), "경": ("금", 0), "신": ("금", 1),
+            "임": ("수", 0), "계": ("수", 1)
+        }
+        
+        # ⚡ [수정] 지지 십성용 음양(체용) 설정 완벽 수정
+        # 자(음), 축(음), 인(양), 묘(음), 진(양), 사(양), 오(음), 미(음), 신(양), 유(음), 술(양), 해(양)
+        self.ji_info = {
+            "자": ("수", 1), # 체는 양이나 용은 음 (계수)
+            "축": ("토", 1), 
+            "인": ("목", 0), 
+            "묘": ("목", 1),
+            "진": ("토", 0), 
+            "사": ("화", 0), # 체는 음이나 용은 양 (병화) -> 님 케이스 해결!
+            "오": ("화", 1), # 체는 양이나 용은 음 (정화)
+            "미": ("토", 1), 
+            "신": ("금", 0), 
+            "유": ("금", 1), 
+            "술": ("토", 0), 
+            "해": ("수", 0)  # 체는 음이나 용은 양 (임수)
+        }
+        
+        self.gan_elements = {k: v[0] for k, v in self.gan_info.items()}
+        self.ji_elements = {k: v[0] for k, v in self.ji_info.items()}
+        
+        self.saeng = {"목": "화", "화": "토", "토": "금", "금": "수", "수": "목"}
+        self.geuk = {"목": "토", "토": "수", "수": "화", "화": "금", "금": "목"}
+
+        self.chung_rules = {
+            frozenset(["갑", "경"]): 8, frozenset(["을", "신"]): 5,
+            frozenset(["병", "임"]): 8, frozenset(["정", "계"]): 5,
+            frozenset(["무", "갑"]): 8, frozenset(["기", "계"]): 3
+        }
+        self.hap_rules = {
+            frozenset(["갑", "기"]): {"토": 8, "목": -5},
+            frozenset(["을", "경"]): {"금": 8, "목": -5},
+            frozenset(["병", "신"]): {"수": 5, "화": -3, "금": -3},
+            frozenset(["정", "임"]): {"목": 5, "화": 3, "수": -3},
+            frozenset(["무", "계"]): {"화": 5, "토": 3, "수": -3}
+        }
+        self.jiji_chung_rules = [
+            ({"자", "오"}, "수", "화", 7), ({"묘", "유"}, "목", "금", 5), ({"사", "해"}, "화", "수", 8)
+        ]
+        self.samhap_rules = {
+            "목": {"members": {"해", "묘", "미"}, "name": "해묘미"},
+            "화": {"members": {"인", "오", "술"}, "name": "인오술"},
+            "금": {"members": {"사", "유", "축"}, "name": "사유축"},
+            "수": {"members": {"신", "자", "진"}, "name": "신자진"}
+        }
+        self.banghap_rules = {
+            "목": {"members": {"인", "묘", "진"}, "name": "인묘진"},
+            "화": {"members": {"사", "오", "미"}, "name": "사오미"},
+            "금": {"members": {"신", "유", "술"}, "name": "신유술"},
+            "수": {"members": {"해", "자", "축"}, "name": "해자축"}
+        }
+
+    def get_60ganji(self, gan_idx, ji_idx): return self.gan[gan_idx % 10] + self.ji[ji_idx % 12]
+    
+    def get_year_pillar(self, year): 
+        return self.get_60ganji((year - 1984) % 60 % 10, (year - 1984) % 60 % 12)
+        
+    def get_month_pillar(self, year_pillar, date_obj):
+        year_gan = year_pillar[0]
+        month = date_obj.month
+        day = date_obj.day
+        if day < 6:
+            month -= 1
+            if month == 0: month = 12
+        saju_month_idx = (month - 2) % 12
+        month_ji_char = self.month_ji[saju_month_idx]
+        year_gan_idx = self.gan.index(year_gan)
+        start_gan_idx = (year_gan_idx % 5) * 2 + 2
+        month_gan_idx = (start_gan_idx + saju_month_idx) % 10
+        return self.gan[month_gan_idx] + month_ji_char
+
+    def get_day_pillar(self, date_obj):
+        days_diff = (date_obj - datetime(1900, 1, 1)).days
+        return self.get_60ganji((10 + days_diff) % 60 % 10, (10 + days_diff) % 60 % 12)
+
+    def get_time_pillar(self, day_pillar, hour):
+        day_gan = day_pillar[0]
+        time_idx = (hour + 1) // 2 % 12
+        day_gan_idx = self.gan.index(day_gan)
+        start_gan_idx = (day_gan_idx % 5) * 2
+        return self.gan[(start_gan_idx + time_idx) % 10] + self.ji[time_idx]
+
+    def get_ten_gods(self, day_gan, target_char):
+        if target_char == "?" or (target_char not in self.gan_info and target_char not in self.ji_info):
+            return ""
+        day_elem, day_pol = self.gan_info[day_gan]
+        if target_char in self.gan_info:
+            target_elem, target_pol = self.gan_info[target_char]
+        else:
+            target_elem, target_pol = self.ji_info[target_char]
+            
+        if day_elem == target_elem: return "비견" if day_pol == target_pol else "겁재"
+        elif self.saeng[day_elem] == target_elem: return "식신" if day_pol == target_pol else "상관"
+        elif self.geuk[day_elem] == target_elem: return "편재" if day_pol == target_pol else "정재"
+        elif self.geuk[target_elem] == day_elem: return "편관" if day_pol == target_pol else "정관"
+        elif self.saeng[target_elem] == day_elem: return "편인" if day_pol == target_pol else "정인"
+        return ""
+
+    def calculate_weighted_scores(self, pillars):
+        base_weights = [[10, 7], [17, 15], [20, 20], [10, 5]]
+        
+        day_gan = pillars[2][0] 
+        my_element = self.gan_elements[day_gan]
+        
+        element_scores = {"목": 0, "화": 0, "토": 0, "금": 0, "수": 0}
+        jiji_scores = {"목": 0, "화": 0, "토": 0, "금": 0, "수": 0}
+        total_strength_score = 0
+        logs = [] 
+
+        # Step 1: 기본 점수
+        for i, pillar in enumerate(pillars):
+            for j, char in enumerate(pillar):
+                weight = base_weights[i][j]
+                elem = self.gan_elements.get(char, self.ji_elements.get(char))
+                element_scores[elem] += weight
+                if j == 1: jiji_scores[elem] += weight
+                
+                if elem == my_element: total_strength_score += weight
+                elif self.saeng[elem] == my_element: total_strength_score += weight
+                elif self.saeng[my_element] == elem: total_strength_score -= weight
+                elif self.geuk[my_element] == elem: total_strength_score -= weight
+                elif self.geuk[elem] == my_element: total_strength_score -= weight
+
+        # Step 2: 천간충
+        for i, pillar in enumerate(pillars):
+            if i != 2:
+                pair = frozenset([day_gan, pillar[0]])
+                if pair in self.chung_rules:
+                    penalty = self.chung_rules[pair]
+                    element_scores[my_element] -= penalty
+                    total_strength_score -= penalty
+                    logs.append(f"💥 천간충 ({day_gan} 💥 {pillar[0]})! 내 기운 -{penalty}")
+
+        # Step 3: 천간합
+        stems = [p[0] for p in pillars if p[0] != "?"]
+        for pair, changes in self.hap_rules.items():
+            if pair.issubset(set(stems)):
+                for elem, score in changes.items():
+                    element_scores[elem] += score
+                    if score > 0:
+                        if elem == my_element or self.saeng[elem] == my_element: total_strength_score += score
+                        else: total_strength_score -= score
+                logs.append(f"💖 천간합 ({' ❤️ '.join(pair)}) 성립!")
+
+        # Step 4: 지지충
+        branches = [p[1] for p in pillars if p[1] != "?"]
+        branches_set = set(branches)
+        for rule_set, e1, e2, sc in self.jiji_chung_rules:
+            if rule_set.issubset(branches_set):
+                w, l = (e1, e2) if jiji_scores[e1] >= jiji_scores[e2] else (e2, e1)
+                element_scores[w] += sc
+                element_scores[l] -= sc
+                
+                if w == my_element or self.saeng[w] == my_element: total_strength_score += sc
+                else: total_strength_score -= sc
+                if l == my_element or self.saeng[l] == my_element: total_strength_score -= sc
+                else: total_strength_score += sc
+                
+                conflict_str = f"{list(rule_set)[0]} 💥 {list(rule_set)[1]}"
+                logs.append(f"⚔️ 지지충 ({conflict_str})! 승자:{w}(+{sc})")
+
+        # Step 5: 삼합/방합
+        for rules in [self.samhap_rules, self.banghap_rules]:
+            for target, rule in rules.items():
+                cnt = len(rule["members"].intersection(branches_set))
+                add = 10 if cnt == 3 else (6 if cnt == 2 else 0)
+                if add > 0:
+                    element_scores[target] += add
+                    matched = ",".join(rule["members"].intersection(branches_set))
+                    logs.append(f"🌀 {rule['name']} ({matched}) +{add}")
+                    
+                    if target == my_element or self.saeng[target] == my_element: total_strength_score += add
+                    else: total_strength_score -= add
+
+        # Step 6: 병존
+        for seq in [stems, branches]:
+            for k in range(len(seq)-1):
+                if seq[k] == seq[k+1] and seq[k] != "?":
+                    elem = self.gan_elements.get(seq[k], self.ji_elements.get(seq[k]))
+                    element_scores[elem] += 10
+                    logs.append(f"👯 병존 ({seq[k]} 🤝 {seq[k]}) +10")
+                    
+                    if elem == my_element or self.saeng[elem] == my_element: total_strength_score += 10
+                    else: total_strength_score -= 10
+
+        # Step 7: Top 2 Battle
+        sorted_scores = sorted(element_scores.items(), key=lambda x: x[1], reverse=True)
+        top1_elem = sorted_scores[0][0]
+        top2_elem = sorted_scores[1][0]
+        battle_log = ""
+        bonus = 10
+        
+        if self.geuk[top1_elem] == top2_elem:
+            element_scores[top1_elem] += bonus
+            element_scores[top2_elem] -= bonus
+            battle_log = f"1위({top1_elem})가 2위({top2_elem})를 제압하여 격차 벌어짐"
+        elif self.geuk[top2_elem] == top1_elem:
+            element_scores[top2_elem] += bonus
+            element_scores[top1_elem] -= bonus
+            battle_log = f"2위({top2_elem})가 1위({top1_elem})를 맹렬히 공격! (하극상)"
+            if top1_elem == my_element: total_strength_score -= bonus
+            if top2_elem == my_element: total_strength_score += bonus
+        elif self.saeng[top1_elem] == top2_elem:
+            element_scores[top1_elem] -= 5
+            element_scores[top2_elem] += 10
+            battle_log = f"1위({top1_elem})가 2위({top2_elem})를 생하여 기운 설기됨"
+
+        if battle_log: logs.append(f"🏆 **세력전쟁:** {battle_log}")
+
+        return element_scores, total_strength_score, my_element, logs
+    
+    def convert_to_sibseong(self, my_element, element_scores):
+        sibseong_scores = {
+            "비겁 (나/동료)": element_scores[my_element],
+            "식상 (표현/재능)": element_scores[self.saeng[my_element]],
+            "재성 (재물/결과)": element_scores[self.geuk[my_element]],
+            "인성 (지혜/도움)": 0,
+            "관성 (명예/직장)": 0
+        }
+        for key, value in self.saeng.items():
+            if value == my_element:
+                sibseong_scores["인성 (지혜/도움)"] = element_scores[key]; break
+        for key, value in self.geuk.items():
+            if value == my_element:
+                sibseong_scores["관성 (명예/직장)"] = element_scores[key]; break
+        return sibseong_scores
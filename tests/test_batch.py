@@ -0,0 +1,61 @@
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from saju import SajuBatchCalculator, SajuCalculator
+from saju.solar_terms import get_solar_terms
+
+
+def _moments():
+    # 1900~2100 임의 시각 + 모든 절기 직전/직후 1분 (연/월 경계에서 어긋나기 쉬움)
+    rng = random.Random(20240101)
+    start = datetime(1900, 1, 1)
+    moments = [start + timedelta(minutes=rng.randrange(201 * 365 * 1440)) for _ in range(30000)]
+    terms = get_solar_terms()
+    for idx in range(len(terms.minutes)):
+        moment = terms.term_moment(idx)
+        moments += [moment - timedelta(minutes=1), moment]
+    return moments
+
+
+def test_batch_matches_scalar():
+    calc, batch = SajuCalculator(), SajuBatchCalculator()
+    moments = _moments()
+    unknown = np.array([i % 5 == 0 for i in range(len(moments))])
+    dates = np.array([m.date() for m in moments], dtype="datetime64[D]")
+    hours = np.where(unknown, -1, [m.hour for m in moments])
+    minutes = np.array([m.minute for m in moments])
+    columns = np.stack(batch.get_four_pillars(dates, hours, minutes), axis=1).tolist()
+    for moment, is_unknown, codes in zip(moments, unknown, columns):
+        hour, minute = (None, 0) if is_unknown else (moment.hour, moment.minute)
+        assert tuple(codes) == calc.get_pillar_codes(moment.date(), hour, minute), moment
+
+
+@pytest.mark.parametrize("moment, year, month", [
+    (date(1984, 1, 15), "계해", "을축"),
+    (datetime(2000, 2, 4, 21, 39), "기묘", "정축"),
+    (datetime(2000, 2, 4, 21, 40), "경진", "무인"),
+])
+def test_year_and_month_pillar_use_ipchun(moment, year, month):
+    calc = SajuCalculator()
+    assert calc.get_year_pillar(moment) == year
+    assert calc.get_month_pillar(year, moment) == month
+    batch = SajuBatchCalculator()
+    day = np.array([moment], dtype="datetime64[D]")
+    hour = np.array([getattr(moment, "hour", -1)])
+    minute = np.array([getattr(moment, "minute", 0)])
+    year_codes = batch.get_year_pillars(day, hour, minute)
+    assert calc.to_ganji(int(year_codes[0])) == year
+    assert calc.to_ganji(int(batch.get_month_pillars(year_codes, day, hour, minute)[0])) == month
+
+
+def test_month_pillar_rejects_calendar_year():
+    # 양력 연도로 구한 연주를 넘기면 틀린 월간 대신 에러
+    calc = SajuCalculator()
+    with pytest.raises(ValueError):
+        calc.get_month_pillar(calc.get_year_pillar(1984), date(1984, 1, 15))
+    batch = SajuBatchCalculator()
+    with pytest.raises(ValueError):
+        batch.get_month_pillars(batch.get_year_pillars([1984]), np.array(["1984-01-15"], dtype="datetime64[D]"))
@@ -0,0 +1,55 @@
+import pytest
+
+from saju.charts import ohaeng_pie_spec
+from saju.tables import ELEMENTS
+
+alt = pytest.importorskip("altair")
+pd = pytest.importorskip("pandas")
+
+
+def draw_ohaeng_pie_chart(scores):
+    # 템플릿으로 바꾸기 전 app.py 의 Altair 차트 (비교 기준, 그대로 옮김)
+    data = []
+    emoji_map = {"목": "🌲", "화": "🔥", "토": "⛰️", "금": "⚔️", "수": "🌊"}
+    color_range = ["#66BB6A", "#EF5350", "#FFCA28", "#BDBDBD", "#42A5F5"]
+    domain = ["목", "화", "토", "금", "수"]
+
+    for elem, score in scores.items():
+        safe_score = max(0, score)
+        emoji = emoji_map.get(elem, "")
+        data.append({"구분": elem, "점수": safe_score, "이모지": emoji})
+
+    df = pd.DataFrame(data)
+    total = df["점수"].sum()
+    if total == 0: total = 1
+    df["비율"] = df["점수"] / total
+    df["라벨"] = df["이모지"] + " " + (df["비율"] * 100).round(1).astype(str) + "%"
+
+    base = alt.Chart(df).encode(theta=alt.Theta("점수", stack=True))
+    pie = base.mark_arc(innerRadius=55, outerRadius=110).encode(
+        color=alt.Color("구분", scale=alt.Scale(domain=domain, range=color_range), legend=alt.Legend(title="오행")),
+        order=alt.Order("점수", sort="descending"),
+        tooltip=["구분", "점수", alt.Tooltip("비율", format=".1%")]
+    )
+    text = base.mark_text(radius=125).encode(
+        text="라벨", order=alt.Order("점수", sort="descending"), color=alt.value("black"), size=alt.value(18)
+    ).transform_filter(alt.datum.비율 > 0.03)
+    return pie + text
+
+
+@pytest.mark.parametrize("scores", [
+    (0, 0, 0, 0, 0),          # 합계 0 -> 모든 비율 0
+    (-5, -1, 0, -30, 0),      # 음수는 0 으로
+    (10, 0, 3, 87, 0),        # 정확히 3% (라벨 필터 경계)
+    (1, 32, 0, 0, 0),         # 3.03% (경계 바로 위)
+    (2, 65, 0, 0, 0),         # 2.99%
+    (1, 1, 1, 1, 4),          # 12.5% (반올림 경계)
+    (1, 15, 0, 0, 0),         # 6.25%
+    (13, 27, 41, 9, 17),
+])
+def test_spec_matches_altair(scores):
+    expected = draw_ohaeng_pie_chart(dict(zip(ELEMENTS, scores))).to_dict()
+    spec = ohaeng_pie_spec(scores)
+    assert spec["config"] == expected["config"]
+    assert spec["layer"] == expected["layer"]
+    assert spec["data"]["values"] == expected["datasets"][expected["data"]["name"]]
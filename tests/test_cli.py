@@ -0,0 +1,73 @@
+import csv
+import json
+
+import pytest
+
+from saju.cli import _count_lines, analyze_record, count_done, parse_birth_time, run
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("13:30", (13, 30)), (13, (13, 0)), (0, (0, 0)), (None, (None, 0)), ("", (None, 0)), ("모름", (None, 0)),
+])
+def test_parse_birth_time(value, expected):
+    assert parse_birth_time(value) == expected
+
+
+@pytest.mark.parametrize("record", [
+    {"birth_date": "1990-05-17", "birth_time": [13]},
+    {"birth_date": "1990-05-17", "birth_time": "25:00"},
+    {"birth_time": "13:00"},
+    [1, 2],
+])
+def test_bad_record_gets_error_field(record):
+    # 잘못된 줄은 error 만 채우고 예외를 내지 않는다 (배치 전체가 멈추지 않게)
+    assert "error" in analyze_record(record)
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_malformed_jsonl_line_does_not_stop_run(tmp_path):
+    source = _write(tmp_path / "in.jsonl", '{"birth_date": "1990-05-17"}\n{bad json\n{"birth_date": "1991-05-17"}\n')
+    output = str(tmp_path / "out.jsonl")
+    assert run(source, output, workers=1, progress=None) == 3
+    rows = [json.loads(line) for line in open(output, encoding="utf-8")]
+    assert [("error" in row) for row in rows] == [False, True, False]
+    assert rows[1]["record"] == "{bad json"
+
+
+def test_csv_error_becomes_error_row(tmp_path):
+    source = _write(tmp_path / "in.csv", "birth_date,note\n1990-05-17,짧음\n1990-05-18," + "x" * 500 + "\n1990-05-19,짧음\n")
+    output = str(tmp_path / "out.jsonl")
+    limit = csv.field_size_limit(100)
+    try:
+        assert run(source, output, workers=1, progress=None) == 3
+    finally:
+        csv.field_size_limit(limit)
+    rows = [json.loads(line) for line in open(output, encoding="utf-8")]
+    assert [("error" in row) for row in rows] == [False, True, False]
+
+
+def test_count_lines_across_blocks(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_bytes(b'{"a": 1}\n' * 1000 + b'{"a": ')
+    with open(path, "rb") as f:
+        assert _count_lines(f, block_size=7) == (1000, 9000)
+    assert count_done(str(path)) == 1000
+    assert path.stat().st_size == 9000
+
+
+def test_csv_resume_with_quoted_newline(tmp_path):
+    # 입력 필드에 줄바꿈이 있어도 이어하기가 레코드를 건너뛰거나 두 번 쓰지 않는다
+    lines = ["birth_date,birth_time,note"] + [f'1990-05-{d:02d},13:00,"여러\n줄 {d}"' for d in range(1, 21)]
+    source = _write(tmp_path / "in.csv", "\n".join(lines) + "\n")
+    full, partial = tmp_path / "full.csv", tmp_path / "partial.csv"
+    run(source, str(full), workers=1, progress=None)
+    data = full.read_bytes()
+    cut = data.index("줄 13".encode("utf-8"))   # 13번째 레코드의 따옴표 안 줄바꿈 직후에서 끊긴 파일
+    partial.write_bytes(data[:cut])
+    assert count_done(str(partial)) == 12
+    run(source, str(partial), workers=1, resume=True, progress=None)
+    assert partial.read_bytes() == data
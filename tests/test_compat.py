@@ -0,0 +1,28 @@
+import random
+
+import numpy as np
+import pytest
+
+from saju import CompatibilityEngine
+
+
+def _codes(n, seed=7):
+    rng = random.Random(seed)
+    return [(rng.randrange(60), rng.randrange(60), rng.randrange(60), rng.choice([-1, rng.randrange(60)])) for _ in range(n)]
+
+
+def test_top_k_matches_full_matrix():
+    engine = CompatibilityEngine()
+    users, candidates = _codes(50), _codes(300, seed=8)
+    idx, scores = engine.top_k(users, candidates, k=5, candidate_block=64, workers=1)
+    full = engine.score_matrix(users, candidates)
+    np.testing.assert_allclose(scores, -np.sort(-full, axis=1)[:, :5], rtol=1e-5)
+    np.testing.assert_allclose(np.take_along_axis(full, idx, axis=1), scores, rtol=1e-5)
+
+
+@pytest.mark.parametrize("n_candidates, k, exclude_self", [(20, 0, False), (20, -3, False), (1, 5, True)])
+def test_top_k_empty_when_no_candidates_left(n_candidates, k, exclude_self):
+    engine = CompatibilityEngine()
+    users = _codes(n_candidates)
+    idx, scores = engine.top_k(users, users, k=k, exclude_self=exclude_self, workers=1)
+    assert idx.shape == scores.shape == (n_candidates, 0)
@@ -0,0 +1,37 @@
+import random
+from datetime import date
+
+from saju import GAN_ELEM, RULES, SajuCalculator
+from saju.calculator import apply_battle, pre_battle_state, score_pillar_codes
+from saju.luck import apply_luck_pillar, timeline
+from saju.tables import BASE_WEIGHTS
+
+
+def test_luck_pillar_matches_full_rescoring():
+    # 시주를 "운 기둥"처럼 3주 상태에 더하면 4주를 처음부터 계산한 것과 같아야 한다.
+    # 운에는 병존(일-시)이 없고, 원국에 지지충이 있으면 승자가 시주 포함 여부로 달라질 수 있어 그 둘은 뺀다.
+    rng = random.Random(3)
+    checked = 0
+    while checked < 30000:
+        y, mi, d, ti = rng.randrange(60), rng.randrange(12), rng.randrange(60), rng.randrange(12)
+        m = (6 * ((y % 10 % 5) * 2 + 2 + mi) - 5 * (mi + 2)) % 60
+        t = (6 * (((d % 10 % 5) * 2 + ti) % 10) - 5 * ti) % 60
+        if t % 10 == d % 10 or t % 12 == d % 12: continue
+        scores, jiji, strength, _, stem_mask, branch_mask = pre_battle_state((y, m, d, -1))
+        if RULES.branch_events(branch_mask)[0]: continue
+        state = apply_luck_pillar((tuple(scores), tuple(jiji), strength, stem_mask, branch_mask), t, BASE_WEIGHTS[3],
+                                  d % 10, RULES)
+        luck_scores = list(state[0])
+        luck_strength, battle = apply_battle(luck_scores, state[2], GAN_ELEM[d % 10])
+        expected = score_pillar_codes((y, m, d, t))
+        assert (tuple(luck_scores), luck_strength, battle) == (expected[0], expected[1], expected[4]), (y, m, d, t)
+        checked += 1
+
+
+def test_timeline_shape():
+    periods = timeline(date(1990, 5, 17), 14, 30, "남성", calc=SajuCalculator())
+    seun = [p for p in periods if p["kind"] == "세운"]
+    daeun = [p for p in periods if p["kind"] == "대운"]
+    assert len(seun) == 100
+    assert [p["age"] for p in daeun] == sorted(p["age"] for p in daeun)
+    assert all(b["age"] - a["age"] == 10 for a, b in zip(daeun, daeun[1:]))
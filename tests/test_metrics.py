@@ -0,0 +1,90 @@
+import re
+from datetime import date
+
+import pytest
+
+from saju import SajuCalculator, metrics
+
+HISTOGRAM_LINE = re.compile(r'saju_stage_duration_seconds_(bucket|sum|count)\{stage="([^"]+)"(?:,le="([^"]+)")?\} (\S+)')
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    yield metrics.REGISTRY
+    metrics.reset()
+
+
+def test_scoring_a_chart_records_stages_rules_and_battle(registry):
+    calc = SajuCalculator()
+    # 1990-05-17 13:30 = 경오 신사 임오 정미: 정임합(천간합), 사오미(삼합·방합), 세력전쟁 제압(화 -> 금)
+    for _ in range(2):
+        result = calc.analyze(date(1990, 5, 17), 13, 30)
+    assert result["pillars"] == ["경오", "신사", "임오", "정미"]
+
+    snap = metrics.snapshot()
+    stages = snap["stages"]
+    for name in ("analyze", "pillars", "score", "sibseong", "logs"):
+        assert stages[name]["count"] == 2, name
+    for name in metrics.SCORE_STEPS:
+        assert stages[name]["count"] == 1, name   # 두 번째는 캐시 적중이라 Step 은 한 번만
+    assert snap["counters"] == {"score.computed": 1}
+
+    rules = {(r["rule"], r["kind"]): r["count"] for r in snap["rules"]}
+    assert rules == {("정임합", "천간합"): 2, ("사오미", "삼합·방합"): 2}
+    assert snap["rule_kinds"] == {"천간합": 2, "삼합·방합": 2}
+    assert snap["battles"] == {"제압": 2}
+    lines = metrics.prometheus().splitlines()
+    assert 'saju_rule_fired_total{rule="정임합",kind="천간합"} 2' in lines
+    assert 'saju_battle_total{kind="제압"} 2' in lines
+    assert 'saju_events_total{event="score.computed"} 1' in lines
+
+
+def test_timed_and_stage_use_the_registry(registry):
+    @metrics.timed("ui.draw")
+    def draw(): return 1
+
+    draw()
+    with metrics.stage("ui.submit"):
+        draw()
+    stages = metrics.snapshot()["stages"]
+    assert stages["ui.draw"]["count"] == 2 and stages["ui.submit"]["count"] == 1
+
+
+def test_disabled_metrics_change_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", False)
+    calc = SajuCalculator()
+    assert "score_codes" not in vars(calc)
+    assert metrics.stage("x") is metrics.stage("y")
+
+
+def test_prometheus_histograms_are_well_formed(registry):
+    calc = SajuCalculator()
+    for day in range(1, 29):
+        calc.analyze(date(1990, 2, day), day % 24, 0)
+    text = metrics.prometheus()
+    assert text.endswith("\n")
+    assert 'saju_rule_fired_total{rule="' in text and 'saju_battle_total{kind="' in text
+
+    histograms = {}
+    for line in text.splitlines():
+        match = HISTOGRAM_LINE.fullmatch(line)
+        if match is None:
+            assert line.startswith("#") or not line.startswith("saju_stage_duration_seconds"), line
+            continue
+        kind, stage, le, value = match.groups()
+        entry = histograms.setdefault(stage, {"buckets": []})
+        if kind == "bucket": entry["buckets"].append((le, int(value)))
+        else: entry[kind] = float(value) if kind == "sum" else int(value)
+
+    assert set(metrics.SCORE_STEPS) <= set(histograms)
+    for stage, entry in histograms.items():
+        bounds = [le for le, _ in entry["buckets"]]
+        counts = [n for _, n in entry["buckets"]]
+        assert bounds[-1] == "+Inf", stage
+        assert [float(b) for b in bounds[:-1]] == sorted(float(b) for b in bounds[:-1]), stage
+        assert counts == sorted(counts), stage                 # 누적이므로 줄지 않는다
+        assert counts[-1] == entry["count"] > 0, stage         # +Inf == _count
+        assert entry["sum"] >= 0, stage
+    assert histograms["analyze"]["count"] == 28
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+import pytest
+
+from saju import SajuCalculator
+from saju.pillar_index import build
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    return build(str(tmp_path_factory.mktemp("pillar_index")), 1990, 1990)
+
+
+def _hours(ranges):
+    # 구간 -> 안에 든 매시 정각
+    for start, end in ranges:
+        moment = start
+        while moment < end:
+            yield moment
+            moment += timedelta(hours=1)
+
+
+@pytest.mark.parametrize("criteria", [{"day": "신사"}, {"time": "경자"}, {"day": "경진", "time": "병자"}])
+def test_find_matches_calculator(index, criteria):
+    # find() 가 돌려준 구간의 매시 정각을 계산기로 다시 풀면 질의한 기둥이 나와야 하고, 빠진 시각도 없어야 한다
+    calc = SajuCalculator()
+    positions = {"day": 2, "time": 3}
+    found = set(_hours(index.find(**criteria)))
+    assert found
+    moment = index.slot_start(0)
+    while moment.year == 1990:
+        pillars = calc.analyze(moment.date(), moment.hour, with_logs=False)["pillars"]
+        matches = all(pillars[positions[name]] == value for name, value in criteria.items())
+        assert matches == (moment in found), (moment, pillars)
+        moment += timedelta(hours=1)
+
+
+def test_late_night_stays_on_same_day(index):
+    # 23시(야자시)는 그날 일주: 1990-01-15 는 경진일
+    ranges = index.find(date(1990, 1, 14), date(1990, 1, 16), day="경진")
+    assert [(a.isoformat(), b.isoformat()) for a, b in ranges] == [("1990-01-15T00:00:00", "1990-01-16T00:00:00")]
+    assert SajuCalculator().analyze(date(1990, 1, 15), 23)["pillars"][2] == "경진"
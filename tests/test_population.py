@@ -0,0 +1,24 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from saju import SajuCalculator
+from saju.population import POPULATION_PATH, PopulationStats, build
+
+
+def test_shipped_population_loads():
+    # 규칙표나 신강 구간 경계를 바꾸면 population.npz 도 다시 만들어야 한다 (python -m saju.population)
+    stats = PopulationStats.load(POPULATION_PATH)
+    assert stats.total == int(stats.power_counts.sum())
+
+
+def test_counts_match_calculator(tmp_path):
+    stats = build(str(tmp_path / "population.npz"), 1990, 1990, workers=1)
+    calc = SajuCalculator()
+    power = np.zeros(len(stats.power_counts), dtype=np.int64)
+    day = date(1990, 1, 1)
+    while day.year == 1990:
+        for hour in range(24):
+            power[calc.get_power_bucket(calc.analyze(day, hour, with_logs=False)["strength"])] += 1
+        day += timedelta(days=1)
+    assert power.tolist() == stats.power_counts.tolist()
@@ -0,0 +1,52 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from saju import SajuCalculator
+from saju.calculator import score_pillar_codes
+from saju.rules import RULES
+from saju.score_table import ScoreTable
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return ScoreTable.build(str(tmp_path_factory.mktemp("score_table") / "score_table.npy"))
+
+
+def test_lookup_matches_scoring(table):
+    calc = SajuCalculator(cache_size=0)
+    rng = random.Random(7)
+    for _ in range(3000):
+        birth_date = date(1900, 1, 1) + timedelta(days=rng.randrange(73000))
+        hour = rng.choice([None, *range(24)])
+        codes = calc.get_pillar_codes(birth_date, hour, rng.randrange(60))
+        assert table.lookup(codes) == score_pillar_codes(codes, RULES), codes
+
+
+def test_every_slot_is_reachable_once(table):
+    calc = SajuCalculator(cache_size=0)
+    seen = set()
+    for y in range(60):
+        for mi in range(12):
+            m = calc.get_month_code_by_idx(y, mi)
+            for d in range(60):
+                for t in [calc.get_time_code(d, 2 * t) for t in range(12)] + [-1]:
+                    seen.add(table.index((y, m, d, t)))
+    assert seen == set(range(ScoreTable.size))
+
+
+@pytest.mark.parametrize("codes", [
+    (0, 1, 0, 0),     # 갑년의 축월은 정축(13)이지 을축(1)이 아니다
+    (0, 2, 0, 13),    # 갑일의 축시는 을축(1)이지 정축(13)이 아니다
+    (0, 2, 0, 12),    # 갑일의 자시는 갑자(0)이지 병자(12)가 아니다
+])
+def test_unreachable_combinations_have_no_slot(table, codes):
+    assert ScoreTable.index(codes) is None
+    assert table.lookup(codes) is None
+
+
+def test_calculator_rejects_other_rules_version(table):
+    with pytest.raises(ValueError):
+        SajuCalculator(score_table=ScoreTable(table.records, "다른-규칙표"))
+    assert SajuCalculator(score_table=table).score_table is table
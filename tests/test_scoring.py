@@ -0,0 +1,45 @@
+import re
+
+from saju import GAN, GANJI, JI, SajuCalculator
+
+from .reference_saju import SajuCalculator as ReferenceCalculator
+
+
+def _known_hour_charts():
+    # 실제로 나올 수 있는 모든 원국: 연주 60 x 월(연간으로 정해짐) 12 x 일주 60 x 시(일간으로 정해짐) 12
+    for y in range(60):
+        for mi in range(12):
+            m = (6 * ((y % 10 % 5) * 2 + 2 + mi) - 5 * (mi + 2)) % 60
+            for d in range(60):
+                for ti in range(12):
+                    yield y, m, d, (6 * (((d % 10 % 5) * 2 + ti) % 10) - 5 * ti) % 60
+
+
+def _normalize_logs(logs):
+    # "(자,진)", "(갑 ❤️ 기)", "(자 💥 오)" 처럼 원국의 글자를 나열한 부분은 순서만 다를 수 있다
+    def sort_chars(match):
+        parts = re.split(r"\s*(?:,|❤️|💥)\s*", match.group(1))
+        return "(" + "|".join(sorted(parts)) + ")" if all(p in GAN + JI for p in parts) else match.group(0)
+    return sorted(re.sub(r"\(([^()]*)\)", sort_chars, line) for line in logs)
+
+
+def test_scores_match_original_calculator():
+    # 규칙표/점수표/점수 코어를 바꿔도 원래 app.py 계산기와 결과(점수, 일간 오행, 로그, 십성)가 같아야 한다
+    reference, calc = ReferenceCalculator(), SajuCalculator(cache_size=0)
+    n = 0
+    for codes in _known_hour_charts():
+        pillars = [GANJI[c] for c in codes]
+        expected = reference.calculate_weighted_scores(pillars)
+        actual = calc.calculate_weighted_scores(pillars)
+        assert actual[:3] == expected[:3], pillars
+        assert _normalize_logs(actual[3]) == _normalize_logs(expected[3]), pillars
+        assert calc.convert_to_sibseong(actual[2], actual[0]) == reference.convert_to_sibseong(expected[2], expected[0])
+        n += 1
+    assert n == 518400
+
+
+def test_ten_gods_match_original_calculator():
+    reference, calc = ReferenceCalculator(), SajuCalculator()
+    for day_gan in GAN:
+        for target in [*GAN, *JI, "?", "??", ""]:
+            assert calc.get_ten_gods(day_gan, target) == reference.get_ten_gods(day_gan, target), (day_gan, target)
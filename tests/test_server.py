@@ -0,0 +1,83 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from saju import server
+from saju.server import MicroBatcher, SajuServer
+
+
+def _request(payload):
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            server = SajuServer(MicroBatcher(executor, window=0.001))
+            return await server.handle("POST", "/analyze", json.dumps(payload).encode("utf-8"))
+    return asyncio.run(run())
+
+
+def test_numeric_birth_time_is_accepted():
+    status, body = _request({"birth_date": "1990-05-17", "birth_time": 13})
+    assert status == 200
+    assert json.loads(body)["birth_time"] == "13:00"
+
+
+@pytest.mark.parametrize("payload", [
+    {"birth_date": "1990-05-17", "birth_time": [13]},
+    {"birth_date": "1990-05-17", "birth_time": "25:00"},
+    {"birth_time": "13:00"},
+    "1990-05-17",
+])
+def test_bad_input_raises_client_error(payload):
+    # serve_connection 이 400 으로 바꾸는 예외만 나와야 한다 (그 밖의 예외는 500)
+    with pytest.raises((KeyError, ValueError, TypeError, AttributeError)):
+        _request(payload)
+
+
+def _batch(batcher, keys):
+    async def run():
+        return await asyncio.gather(*(batcher.get(key) for key in keys), return_exceptions=True)
+    return asyncio.run(run())
+
+
+def test_failing_key_does_not_fail_its_batch(monkeypatch):
+    analyze_key = server.analyze_key
+
+    def flaky(key):
+        if key[0] == "1990-05-18": raise ValueError("이 키만 실패")
+        return analyze_key(key)
+
+    monkeypatch.setattr(server, "analyze_key", flaky)
+    keys = [("1990-05-17", 13, 0, False), ("1990-05-18", 13, 0, False), ("1990-05-19", None, 0, False)]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batcher = MicroBatcher(executor, window=0.01)
+        ok1, failed, ok2 = _batch(batcher, keys)
+    assert batcher.stats["batches"] == 1
+    assert isinstance(failed, ValueError)
+    assert json.loads(ok1)["birth_date"] == "1990-05-17"
+    assert json.loads(ok2)["birth_time"] is None
+    assert keys[1] not in batcher.cache
+
+
+class _BrokenPool(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs): raise BrokenProcessPool("워커가 죽었습니다")
+
+
+def test_broken_pool_is_replaced():
+    made = []
+
+    def make_executor():
+        made.append(ThreadPoolExecutor(max_workers=1))
+        return made[-1]
+
+    batcher = MicroBatcher(_BrokenPool(), window=0.001, make_executor=make_executor)
+    body, = _batch(batcher, [("1990-05-17", 13, 0, False)])
+    assert json.loads(body)["birth_time"] == "13:00"
+    assert batcher.executor is made[0] and batcher.stats["pool_restarts"] == 1
+
+    # 새 풀도 깨지면 요청은 실패하지만, 다음 요청을 위해 풀은 또 바뀌어 있다
+    batcher = MicroBatcher(_BrokenPool(), window=0.001, make_executor=_BrokenPool)
+    error, = _batch(batcher, [("1990-05-17", 13, 0, False)])
+    assert isinstance(error, BrokenProcessPool) and batcher.stats["pool_restarts"] == 2
+    for executor in made: executor.shutdown()
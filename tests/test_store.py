@@ -0,0 +1,114 @@
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+
+from saju.calculator import SajuCalculator
+from saju.store import RESULT_VERSION, ResultStore
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        kwargs.setdefault("flush_interval", 60)   # 백그라운드 flush 가 끼어들지 않게
+        store = ResultStore(str(tmp_path / "results.sqlite3"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores: store.close()
+
+
+def test_round_trip_keeps_tuple_codes(make_store):
+    result = SajuCalculator().analyze(date(1990, 5, 17), 13, 30)
+    store = make_store()
+    store.put(date(1990, 5, 17), 13, 30, result)
+    store.flush()
+    assert store._pending == {}
+
+    got = make_store().get(date(1990, 5, 17), 13, 30)   # 버퍼가 아니라 DB 에서 읽는다
+    assert got == result
+    assert isinstance(got["codes"], tuple)
+    assert store.get(date(1990, 5, 17), None) is None
+
+
+def test_unknown_hour_keys_collapse(make_store):
+    store = make_store()
+    store.put(date(1990, 5, 17), None, 45, {"a": 1})
+    assert store.get(date(1990, 5, 17), -1, 0) == {"a": 1}
+
+
+def test_lru_eviction_past_max_rows(make_store):
+    store = make_store(max_rows=10)
+    days = [date(2000, 1, d) for d in range(1, 11)]
+    for i, day in enumerate(days):
+        store.put(day, 0, 0, {"i": i})
+        store.flush()
+        time.sleep(0.002)   # 조회 시각(ms)이 겹치지 않게
+    assert store.get(days[0], 0, 0) == {"i": 0}   # 가장 오래된 행을 방금 조회 -> 살아남아야 함
+    store.flush()
+    time.sleep(0.002)
+
+    store.put(date(2000, 2, 1), 0, 0, {"i": 10})
+    store.flush()
+    assert len(store) == 9   # 넘친 1행 + 여유 10% 를 오래된 순으로 지움
+    assert store.get(days[0], 0, 0) == {"i": 0}
+    assert store.get(days[1], 0, 0) is None
+    assert store.get(date(2000, 2, 1), 0, 0) == {"i": 10}
+
+
+def test_purge_stale_after_version_bump(make_store):
+    old = make_store(rules_version="old")
+    old.put(date(1990, 5, 17), 13, 0, {"v": "old"})
+    old.flush()
+
+    new = make_store()
+    assert new.rules_version == RESULT_VERSION
+    assert new.get(date(1990, 5, 17), 13, 0) is None
+    new.put(date(1990, 5, 17), 13, 0, {"v": "new"})
+    assert new.purge_stale() == 1
+    assert len(new) == 1
+    assert new.get(date(1990, 5, 17), 13, 0) == {"v": "new"}
+
+
+def test_locked_database_never_reaches_caller(make_store, tmp_path):
+    store = make_store(timeout=0.05, batch_size=2)
+    store.put(date(1990, 1, 1), 0, 0, {"i": 0})
+    store.flush()
+
+    blocker = sqlite3.connect(str(tmp_path / "results.sqlite3"), isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        # 버퍼가 가득 차 요청 경로에서 flush 가 일어나도 예외가 나지 않고, 조회 시각 갱신도 조회를 막지 않는다
+        for day in range(2, 6):
+            store.put(date(1990, 1, day), 0, 0, {"i": day})
+        assert store.get(date(1990, 1, 1), 0, 0) == {"i": 0}
+        assert store.get(date(1990, 1, 5), 0, 0) == {"i": 5}   # 버퍼에 남은 것은 그대로 보인다
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+        assert len(store._pending) == 4 and len(store._touched) == 1   # 쓰지 못한 것은 버퍼에 되돌아가 있다
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    store.flush()
+    assert store._pending == {} and store._touched == {}
+    assert len(store) == 5
+    assert make_store().get(date(1990, 1, 3), 0, 0) == {"i": 3}
+
+
+def test_buffer_is_capped_while_locked(make_store, tmp_path):
+    store = make_store(timeout=0.05, batch_size=2, max_buffer=3)
+    blocker = sqlite3.connect(str(tmp_path / "results.sqlite3"), isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        for day in range(1, 11):
+            store.put(date(1990, 1, day), 0, 0, {"i": day})
+        assert len(store._pending) <= 3
+        assert store.get(date(1990, 1, 10), 0, 0) == {"i": 10}   # 최신 것이 남는다
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()